@@ -16,6 +16,28 @@ from app.agents.prompts.companion_prompt import (
 
 logger = logging.getLogger(__name__)
 
+# 情绪 -> 处理策略（闲聊意图优先于情绪，单独判断）
+EMOTION_HANDLING_STRATEGY = {
+    "anxious": "comfort_and_clarify",
+    "confused": "simplify_and_guide",
+    "frustrated": "listen_and_support",
+    "urgent": "efficient_response",
+    "positive": "maintain_momentum",
+    "neutral": "friendly_engagement"
+}
+DEFAULT_HANDLING_STRATEGY = "friendly_engagement"
+
+# 这些情绪下不主动引导回信息收集
+NO_TRANSITION_EMOTIONS = frozenset({"frustrated"})
+
+# 情绪 -> 快捷选项（与收集进度无关）
+EMOTION_QUICK_OPTIONS = {
+    "anxious": ("帮我理清思路", "先回答一些问题", "我需要休息一下"),
+    "confused": ("从头开始", "解释一下流程", "我先想想"),
+    "frustrated": ("继续吧", "让我冷静一下", "有什么问题吗"),
+    "urgent": ("快速填写关键信息", "我需要帮助", "有什么捷径吗"),
+}
+
 
 @dataclass
 class CompanionResponse:
@@ -35,6 +57,8 @@ class CompanionResponse:
 class CompanionAgent:
     """Companion Agent for emotional support and conversation"""
 
+    __slots__ = ("llm_client",)
+
     def __init__(self):
         self.llm_client = get_llm_client()
 
@@ -237,16 +261,7 @@ class CompanionAgent:
             return "casual_chat"
 
         # For emotional expressions
-        emotion_strategies = {
-            "anxious": "comfort_and_clarify",
-            "confused": "simplify_and_guide",
-            "frustrated": "listen_and_support",
-            "urgent": "efficient_response",
-            "positive": "maintain_momentum",
-            "neutral": "friendly_engagement"
-        }
-
-        return emotion_strategies.get(emotion, "friendly_engagement")
+        return EMOTION_HANDLING_STRATEGY.get(emotion, DEFAULT_HANDLING_STRATEGY)
 
     def _should_transition(self, emotion: str, intent: IntentType) -> bool:
         """Determine if we should transition back to collection"""
@@ -254,7 +269,7 @@ class CompanionAgent:
         if intent == IntentType.CHITCHAT:
             return False
 
-        if emotion in ["frustrated"]:
+        if emotion in NO_TRANSITION_EMOTIONS:
             return False
 
         # For other emotions, gentle transition is okay
@@ -278,17 +293,12 @@ class CompanionAgent:
         """Get quick options based on emotion"""
         from app.core.phase_inference import get_completion_info
 
-        completion = get_completion_info(fields_status)
+        # Emotion-specific options (no need to compute completion)
+        options = EMOTION_QUICK_OPTIONS.get(emotion)
+        if options:
+            return list(options)
 
-        # Emotion-specific options
-        if emotion == "anxious":
-            return ["帮我理清思路", "先回答一些问题", "我需要休息一下"]
-        elif emotion == "confused":
-            return ["从头开始", "解释一下流程", "我先想想"]
-        elif emotion == "frustrated":
-            return ["继续吧", "让我冷静一下", "有什么问题吗"]
-        elif emotion == "urgent":
-            return ["快速填写关键信息", "我需要帮助", "有什么捷径吗"]
+        completion = get_completion_info(fields_status)
 
         # Default options
         if completion["can_submit"]:
@@ -1,81 +1,85 @@
 """Companion Agent Prompt Templates - 情感陪伴专家"""
 
+import itertools
+import json
+import re
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 from app.agents.prompts.persona import PERSONA_INJECTION, VARIETY_INSTRUCTION
 
 # Emotion-specific response strategies (ERABU style - 机警幽默)
-EMOTION_STRATEGIES = {
-    "anxious": {
+EMOTION_STRATEGIES = MappingProxyType({
+    "anxious": MappingProxyType({
         "acknowledge": "搬家嘛，谁不头疼呢😅 正常正常",
-        "comfort": [
+        "comfort": (
             "别慌，我见过比这复杂的多了",
             "有我帮你盯着，出不了岔子的",
             "说实话，焦虑是正常的，搞完就好了"
-        ],
+        ),
         "practical": "这么说吧，咱们一个个理清楚，没你想的那么复杂",
         "redirect": "来，咱们列一下要做的事，心里就有数了"
-    },
-    "confused": {
+    }),
+    "confused": MappingProxyType({
         "acknowledge": "搬家这事确实有点乱，我懂我懂",
-        "comfort": [
+        "comfort": (
             "不清楚就问嘛，这不是有我呢",
             "慢慢来，想到啥说啥就行",
             "别怕说错，我来帮你理"
-        ],
+        ),
         "practical": "坦白讲，问几个问题就清楚了，不难",
         "redirect": "咱们从简单的开始，一个个来"
-    },
-    "frustrated": {
+    }),
+    "frustrated": MappingProxyType({
         "acknowledge": "我懂，搬家是真烦人😅",
-        "comfort": [
+        "comfort": (
             "吐槽一下也好，我陪你骂两句",
             "麻烦的事我帮你处理，你轻松点",
             "发泄完了咱们继续，没事的"
-        ],
+        ),
         "practical": "说实话，啥事让你烦？说出来咱们一起骂一骂然后解决",
         "redirect": "我尽量帮你简化，不让你太累"
-    },
-    "urgent": {
+    }),
+    "urgent": MappingProxyType({
         "acknowledge": "OK，时间紧，我懂",
-        "comfort": [
+        "comfort": (
             "别急，我们快速搞定",
             "这个我有经验，不会耽误你",
             "紧急的话，先说关键的"
-        ],
+        ),
         "practical": "那咱们直接上干货，其他的后面再说",
         "redirect": "来，快速过一下重点"
-    },
-    "positive": {
+    }),
+    "positive": MappingProxyType({
         "acknowledge": "不错不错，这心态搬家肯定顺利💪",
-        "comfort": [
+        "comfort": (
             "搬家虽然麻烦，但新地方新开始嘛",
             "好心情是搬家成功的一半",
             "就喜欢这种积极的态度"
-        ],
+        ),
         "practical": "那咱们愉快地搞定这些信息吧",
         "redirect": "趁着心情好，咱们继续~"
-    }
-}
+    })
+})
 
 # Chitchat responses for casual conversation (ERABU style)
-CHITCHAT_RESPONSES = {
-    "greeting": [
+CHITCHAT_RESPONSES = MappingProxyType({
+    "greeting": (
         "哈喽~今天咋样？准备搬家的事儿呢？",
         "嗨！我是ERABU，搬家这事找我就对了😎"
-    ],
-    "thanks": [
+    ),
+    "thanks": (
         "不客气啦，这是我的强项~",
         "能帮到你就好！搬家有啥问题随时问"
-    ],
-    "bye": [
+    ),
+    "bye": (
         "好嘞，有需要随时来找我！搬家顺利💪",
         "拜拜~祝搬家一切顺利！"
-    ],
-    "small_talk": [
+    ),
+    "small_talk": (
         "哈哈，聊天也挺好的。对了，搬家的事想好了吗？",
         "是呢~不过咱们还是先把正事办了吧，搬家可不能拖😅"
-    ]
-}
+    )
+})
 
 COMPANION_SYSTEM_PROMPT = """
 {persona}
@@ -116,44 +120,49 @@ COMPANION_SYSTEM_PROMPT = """
 """
 
 
+EMOTION_DESCRIPTIONS = {
+    "anxious": "用户表现出焦虑情绪，可能对搬家感到紧张或担忧",
+    "confused": "用户表现出困惑，可能不清楚如何处理搬家事宜",
+    "frustrated": "用户表现出沮丧或烦躁，可能遇到了困难或不顺",
+    "urgent": "用户表现出紧急感，可能时间紧迫需要快速处理",
+    "positive": "用户心情积极，对搬家持乐观态度",
+    "neutral": "用户情绪平稳，正常交流中"
+}
+
+# 消息关键词提示：(标签, 关键词)，每类预编译成一个交替正则
+_EMOTION_HINT_PATTERNS = [
+    (label, re.compile("|".join(map(re.escape, keywords))))
+    for label, keywords in (
+        ("焦虑", ["担心", "紧张", "害怕", "不安", "烦", "焦虑"]),
+        ("困惑", ["不知道", "不懂", "不清楚", "怎么办", "迷茫"]),
+    )
+]
+
+
 def analyze_emotion(emotion: str, user_message: str = "") -> str:
     """Analyze emotion and provide context"""
-    emotion_descriptions = {
-        "anxious": "用户表现出焦虑情绪，可能对搬家感到紧张或担忧",
-        "confused": "用户表现出困惑，可能不清楚如何处理搬家事宜",
-        "frustrated": "用户表现出沮丧或烦躁，可能遇到了困难或不顺",
-        "urgent": "用户表现出紧急感，可能时间紧迫需要快速处理",
-        "positive": "用户心情积极，对搬家持乐观态度",
-        "neutral": "用户情绪平稳，正常交流中"
-    }
-
-    base = emotion_descriptions.get(emotion, "用户情绪正常")
+    base = EMOTION_DESCRIPTIONS.get(emotion, "用户情绪正常")
 
     # Add message-based analysis hints
     if user_message:
-        keywords_anxiety = ["担心", "紧张", "害怕", "不安", "烦", "焦虑"]
-        keywords_confusion = ["不知道", "不懂", "不清楚", "怎么办", "迷茫"]
-        keywords_frustration = ["烦死", "累", "不想", "算了", "放弃"]
-        keywords_urgent = ["急", "快", "赶", "马上", "立刻"]
-
-        for kw in keywords_anxiety:
-            if kw in user_message:
-                base += f"（消息中包含'{kw}'等焦虑关键词）"
-                break
-        for kw in keywords_confusion:
-            if kw in user_message:
-                base += f"（消息中包含'{kw}'等困惑关键词）"
-                break
+        for label, pattern in _EMOTION_HINT_PATTERNS:
+            match = pattern.search(user_message)
+            if match:
+                base += f"（消息中包含'{match.group(0)}'等{label}关键词）"
 
     return base
 
 
+# 策略表只读，JSON 序列化结果在导入时生成一次
+_EMOTION_STRATEGY_JSON = {
+    emotion: json.dumps(dict(strategy), ensure_ascii=False, indent=2)
+    for emotion, strategy in EMOTION_STRATEGIES.items()
+}
+
+
 def get_emotion_strategy(emotion: str) -> str:
     """Get strategy for handling specific emotion"""
-    import json
-
-    strategy = EMOTION_STRATEGIES.get(emotion, EMOTION_STRATEGIES["positive"])
-    return json.dumps(strategy, ensure_ascii=False, indent=2)
+    return _EMOTION_STRATEGY_JSON.get(emotion, _EMOTION_STRATEGY_JSON["positive"])
 
 
 def format_progress_summary(fields_status: Dict[str, Any]) -> str:
@@ -226,33 +235,48 @@ def build_companion_prompt(
     )
 
 
+# 每类回复按顺序轮换，避免每次调用都走随机数生成
+_CHITCHAT_RESPONSE_CYCLES = {
+    message_type: itertools.cycle(responses)
+    for message_type, responses in CHITCHAT_RESPONSES.items()
+    if responses
+}
+
+
 def get_chitchat_response(message_type: str) -> Optional[str]:
     """Get response for chitchat messages"""
-    import random
-
-    responses = CHITCHAT_RESPONSES.get(message_type)
+    responses = _CHITCHAT_RESPONSE_CYCLES.get(message_type)
     if responses:
-        return random.choice(responses)
+        return next(responses)
     return None
 
 
+# 闲聊关键词，按优先级排列（问候 > 感谢 > 告别）
+CHITCHAT_KEYWORDS = {
+    "greeting": ["你好", "您好", "嗨", "hi", "hello", "早上好", "下午好", "晚上好"],
+    "thanks": ["谢谢", "感谢", "thanks", "thx", "多谢", "谢了"],
+    "bye": ["再见", "拜拜", "bye", "走了", "下次见"],
+}
+
+# 每类关键词预编译成一个交替正则，一次 C 层扫描代替逐个 `in` 检查；
+# 关键词均为小写，IGNORECASE 免去每次调用 message.lower() 的整串复制
+_CHITCHAT_PATTERNS = [
+    (chat_type, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for chat_type, keywords in CHITCHAT_KEYWORDS.items()
+]
+
+
+# 超过该长度的消息不视为闲聊（通常带有实际内容），直接跳过关键词扫描
+MAX_CHITCHAT_LENGTH = 40
+
+
 def detect_chitchat_type(message: str) -> Optional[str]:
     """Detect type of chitchat message"""
-    message_lower = message.lower().strip()
-
-    # Greetings
-    greetings = ["你好", "您好", "嗨", "hi", "hello", "早上好", "下午好", "晚上好"]
-    if any(g in message_lower for g in greetings):
-        return "greeting"
-
-    # Thanks
-    thanks = ["谢谢", "感谢", "thanks", "thx", "多谢", "谢了"]
-    if any(t in message_lower for t in thanks):
-        return "thanks"
-
-    # Bye
-    byes = ["再见", "拜拜", "bye", "走了", "下次见"]
-    if any(b in message_lower for b in byes):
-        return "bye"
+    if not message or len(message) > MAX_CHITCHAT_LENGTH:
+        return None
+
+    for chat_type, pattern in _CHITCHAT_PATTERNS:
+        if pattern.search(message):
+            return chat_type
 
     return None
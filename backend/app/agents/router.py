@@ -2,9 +2,11 @@
 
 import json
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Tuple
 
+from app.config import settings
 from app.core import get_llm_client
 from app.models.schemas import (
     RouterOutput, Intent, IntentType, ExtractedField,
@@ -21,11 +23,205 @@ from app.agents.prompts.router_prompt import (
 logger = logging.getLogger(__name__)
 
 
+# ============ 字段更新表 ============
+# _update_fields_status 按字段名查表分派，每个函数把一个提取结果写入 updated
+
+def _field_dict(updated: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """取出 dict 型字段，缺失或不是 dict 时先置为空 dict"""
+    if key not in updated or not isinstance(updated[key], dict):
+        updated[key] = {}
+    return updated[key]
+
+
+def _update_people_count(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    updated["people_count"] = extracted.parsed_value
+    updated["people_count_status"] = FieldStatus.IDEAL.value
+
+
+def _update_from_address(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    address = _field_dict(updated, "from_address")
+    # Handle parsed_value as dict with value and postal_code
+    if isinstance(extracted.parsed_value, dict):
+        # Merge: only update value if new value is provided
+        new_value = extracted.parsed_value.get("value", "")
+        if new_value:
+            address["value"] = new_value
+        # Merge postal_code
+        if extracted.parsed_value.get("postal_code"):
+            address["postal_code"] = extracted.parsed_value["postal_code"]
+        # R1: from_address 只有在有 postal_code 时才能标记为 baseline
+        if address.get("postal_code"):
+            address["status"] = FieldStatus.BASELINE.value
+        else:
+            address["status"] = FieldStatus.IN_PROGRESS.value
+    else:
+        # Simple value - only update if not empty
+        if extracted.parsed_value:
+            address["value"] = extracted.parsed_value
+        if extracted.needs_verification:
+            address["status"] = FieldStatus.IN_PROGRESS.value
+        else:
+            address["status"] = FieldStatus.BASELINE.value
+
+
+def _update_to_address(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    address = _field_dict(updated, "to_address")
+    # Handle parsed_value as dict with value and city - smart merge
+    if isinstance(extracted.parsed_value, dict):
+        existing_value = address.get("value", "")
+        existing_city = address.get("city", "")
+
+        new_value = extracted.parsed_value.get("value", "")
+        new_city = extracted.parsed_value.get("city", "")
+        new_district = extracted.parsed_value.get("district", "")
+
+        # Merge city (keep existing if new is empty)
+        if new_city:
+            address["city"] = new_city
+        elif existing_city:
+            address["city"] = existing_city
+
+        # Merge district
+        if new_district:
+            address["district"] = new_district
+
+        # Smart merge value: combine existing city with new district
+        if existing_city and new_district and new_district not in existing_value:
+            address["value"] = existing_city + new_district
+        elif new_value and existing_value and len(new_value) < len(existing_value):
+            if new_value not in existing_value:
+                address["value"] = existing_value + new_value
+        elif new_value:
+            address["value"] = new_value
+        elif existing_value:
+            address["value"] = existing_value
+
+        # R2: to_address 需要 city 才能标记为 baseline
+        if address.get("city"):
+            address["status"] = FieldStatus.BASELINE.value
+        else:
+            address["status"] = FieldStatus.IN_PROGRESS.value
+    else:
+        # Simple value - check if adding to existing
+        existing_value = address.get("value", "")
+        new_value = extracted.parsed_value or ""
+        if existing_value and "区" in str(new_value) and str(new_value) not in existing_value:
+            address["value"] = existing_value + str(new_value)
+        elif new_value:
+            address["value"] = new_value
+        if extracted.needs_verification:
+            address["status"] = FieldStatus.IN_PROGRESS.value
+        else:
+            address["status"] = FieldStatus.BASELINE.value
+
+
+def _update_from_building_type(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    _field_dict(updated, "from_address")["building_type"] = extracted.parsed_value
+
+
+def _update_move_date(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    move_date = _field_dict(updated, "move_date")
+    # Merge parsed value if it's a dict
+    if isinstance(extracted.parsed_value, dict):
+        for k, v in extracted.parsed_value.items():
+            if v is not None:
+                move_date[k] = v
+    else:
+        move_date["value"] = extracted.parsed_value
+    # R3: move_date needs year, month, AND day/period for baseline
+    has_day_or_period = (
+        move_date.get("day") is not None or
+        move_date.get("period") is not None
+    )
+    if has_day_or_period and not extracted.needs_verification:
+        move_date["status"] = FieldStatus.BASELINE.value
+    else:
+        move_date["status"] = FieldStatus.IN_PROGRESS.value
+
+
+def _update_move_time_slot(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    _field_dict(updated, "move_date")["time_slot"] = extracted.parsed_value
+
+
+def _floor_elevator_updater(key: str, part: str, other: str):
+    """楼层/电梯写入 part；另一半（other）已有值时标记为 baseline"""
+    def update(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+        floor_elevator = _field_dict(updated, key)
+        floor_elevator[part] = extracted.parsed_value
+        if floor_elevator.get(other) is not None:
+            floor_elevator["status"] = FieldStatus.BASELINE.value
+        else:
+            floor_elevator["status"] = FieldStatus.IN_PROGRESS.value
+    return update
+
+
+def _update_packing_service(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    updated["packing_service"] = extracted.parsed_value
+
+
+def _update_special_notes(updated: Dict[str, Any], extracted: ExtractedField) -> None:
+    if "special_notes" not in updated:
+        updated["special_notes"] = []
+    # LLM 驱动：special_notes_done 由 intent.primary == "complete" 判断
+    # 这里只添加实际的特殊需求
+    notes = updated["special_notes"]
+    if isinstance(extracted.parsed_value, list):
+        for v in extracted.parsed_value:
+            if v and v not in notes:
+                notes.append(v)
+    else:
+        if extracted.parsed_value and extracted.parsed_value not in notes:
+            notes.append(extracted.parsed_value)
+
+
+_FIELD_UPDATERS: Dict[str, Callable[[Dict[str, Any], ExtractedField], None]] = {
+    "people_count": _update_people_count,
+    "from_address": _update_from_address,
+    "to_address": _update_to_address,
+    "from_building_type": _update_from_building_type,
+    "move_date": _update_move_date,
+    "move_time_slot": _update_move_time_slot,
+    "from_floor": _floor_elevator_updater("from_floor_elevator", "floor", "has_elevator"),
+    "from_has_elevator": _floor_elevator_updater("from_floor_elevator", "has_elevator", "floor"),
+    "to_floor": _floor_elevator_updater("to_floor_elevator", "floor", "has_elevator"),
+    "to_has_elevator": _floor_elevator_updater("to_floor_elevator", "has_elevator", "floor"),
+    "packing_service": _update_packing_service,
+    "special_notes": _update_special_notes,
+}
+
+
+def _response_cache_key(
+    user_message: str,
+    fields_status: Dict[str, Any],
+    recent_messages: Optional[List[Dict[str, Any]]]
+) -> Optional[Tuple[str, ...]]:
+    """Router 输出缓存键；缓存关闭或输入无法序列化时返回 None"""
+    if settings.router_cache_size <= 0:
+        return None
+    try:
+        return (
+            user_message,
+            json.dumps(fields_status, sort_keys=True, ensure_ascii=False),
+            json.dumps(recent_messages or [], sort_keys=True, ensure_ascii=False),
+            # 提示词里带当前时间，"下个月"等相对日期按天失效
+            datetime.now().strftime("%Y-%m-%d"),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
 class RouterAgent:
     """Router Agent for intent recognition and decision making"""
 
     def __init__(self):
         self.llm_client = get_llm_client()
+        # 相同输入（消息 + 字段状态 + 最近对话 + 日期）直接复用上次的解析结果，
+        # 重发/重试的消息不再调用 LLM；按 LRU 淘汰，只缓存解析成功的输出
+        self._response_cache: "OrderedDict[Tuple[str, ...], RouterOutput]" = OrderedDict()
+
+    def clear_cache(self) -> None:
+        """Drop all cached router outputs"""
+        self._response_cache.clear()
 
     async def analyze(
         self,
@@ -44,6 +240,13 @@ class RouterAgent:
         Returns:
             RouterOutput with intent, extracted fields, and strategy
         """
+        cache_key = _response_cache_key(user_message, fields_status, recent_messages)
+        cached = self._response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            # 调用方会修改 updated_fields_status，返回深拷贝
+            return cached.model_copy(deep=True)
+
         try:
             # Build prompt
             system_prompt = ROUTER_SYSTEM_PROMPT.format(
@@ -76,15 +279,20 @@ class RouterAgent:
             # Parse response
             content = response.get("content", "{}")
             logger.debug(f"Router LLM response content: {content[:500]}")
-            return self._parse_response(content, fields_status)
+            return self._parse_response(content, fields_status, cache_key)
 
         except Exception as e:
             import traceback
             logger.error(f"Router analysis error: {e}\n{traceback.format_exc()}")
             return self._get_fallback_output(user_message, fields_status)
 
-    def _parse_response(self, content: str, fields_status: Dict[str, Any]) -> RouterOutput:
-        """Parse LLM response into RouterOutput"""
+    def _parse_response(
+        self,
+        content: str,
+        fields_status: Dict[str, Any],
+        cache_key: Optional[Tuple[str, ...]] = None
+    ) -> RouterOutput:
+        """Parse LLM response into RouterOutput (cached under cache_key when parsing succeeds)"""
         try:
             # Clean markdown code blocks if present
             cleaned_content = content.strip()
@@ -184,7 +392,7 @@ class RouterAgent:
 
             # 阶段6：检测用户是否确认提交报价
             # 当 intent 是 confirm 或 request_quote，且在阶段6，设置确认标志
-            if current_phase == 6 and intent.primary in [IntentType.CONFIRM, IntentType.PROVIDE_INFO]:
+            if current_phase == Phase.CONFIRMATION and intent.primary in [IntentType.CONFIRM, IntentType.PROVIDE_INFO]:
                 # 检查用户消息是否包含确认关键词
                 confirm_keywords = ["没问题", "确认", "提交", "发送报价", "ok", "OK", "可以", "好的", "确定", "没错"]
                 # 这里我们需要通过 data 中的原始信息判断，但 intent 已经解析了
@@ -192,17 +400,17 @@ class RouterAgent:
                 pass  # 标志设置移到下面根据 intent 判断
 
             # 当用户在阶段6明确表示确认时，设置标志
-            if phase_after_update == 6 and intent.primary == IntentType.CONFIRM:
+            if phase_after_update == Phase.CONFIRMATION and intent.primary == IntentType.CONFIRM:
                 updated_fields_status["user_confirmed_submit"] = True
                 logger.info("User confirmed submit in phase 6, setting user_confirmed_submit=True")
 
             # LLM 驱动的 special_notes 完成判断
             # 当 LLM 判断 intent 为 "complete" 且在阶段5，表示 special_notes 收集完成
-            if intent.primary == IntentType.COMPLETE and current_phase == 5:
+            if intent.primary == IntentType.COMPLETE and current_phase == Phase.OTHER_INFO:
                 updated_fields_status["special_notes_done"] = True
                 logger.info("LLM determined special_notes complete (intent=complete, phase=5)")
 
-            return RouterOutput(
+            output = RouterOutput(
                 intent=intent,
                 extracted_fields=extracted_fields,
                 user_emotion=emotion,
@@ -212,6 +420,9 @@ class RouterAgent:
                 response_strategy=response_strategy,
                 updated_fields_status=updated_fields_status
             )
+            if cache_key:
+                self._remember(cache_key, output)
+            return output
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON parse error: {e}")
@@ -230,175 +441,23 @@ class RouterAgent:
         updated = current_status.copy()
 
         for field_name, extracted in extracted_fields.items():
-            if extracted.parsed_value is not None:
-                # Map field names to status structure
-                if field_name == "people_count":
-                    updated["people_count"] = extracted.parsed_value
-                    updated["people_count_status"] = FieldStatus.IDEAL.value
-
-                elif field_name == "from_address":
-                    if "from_address" not in updated or not isinstance(updated["from_address"], dict):
-                        updated["from_address"] = {}
-                    # Handle parsed_value as dict with value and postal_code
-                    if isinstance(extracted.parsed_value, dict):
-                        # Merge: only update value if new value is provided
-                        new_value = extracted.parsed_value.get("value", "")
-                        if new_value:
-                            updated["from_address"]["value"] = new_value
-                        # Merge postal_code
-                        if extracted.parsed_value.get("postal_code"):
-                            updated["from_address"]["postal_code"] = extracted.parsed_value["postal_code"]
-                        # R1: from_address 只有在有 postal_code 时才能标记为 baseline
-                        if updated["from_address"].get("postal_code"):
-                            updated["from_address"]["status"] = FieldStatus.BASELINE.value
-                        else:
-                            updated["from_address"]["status"] = FieldStatus.IN_PROGRESS.value
-                    else:
-                        # Simple value - only update if not empty
-                        if extracted.parsed_value:
-                            updated["from_address"]["value"] = extracted.parsed_value
-                        if extracted.needs_verification:
-                            updated["from_address"]["status"] = FieldStatus.IN_PROGRESS.value
-                        else:
-                            updated["from_address"]["status"] = FieldStatus.BASELINE.value
-
-                elif field_name == "to_address":
-                    if "to_address" not in updated or not isinstance(updated["to_address"], dict):
-                        updated["to_address"] = {}
-                    # Handle parsed_value as dict with value and city - smart merge
-                    if isinstance(extracted.parsed_value, dict):
-                        existing_value = updated["to_address"].get("value", "")
-                        existing_city = updated["to_address"].get("city", "")
-
-                        new_value = extracted.parsed_value.get("value", "")
-                        new_city = extracted.parsed_value.get("city", "")
-                        new_district = extracted.parsed_value.get("district", "")
-
-                        # Merge city (keep existing if new is empty)
-                        if new_city:
-                            updated["to_address"]["city"] = new_city
-                        elif existing_city:
-                            updated["to_address"]["city"] = existing_city
-
-                        # Merge district
-                        if new_district:
-                            updated["to_address"]["district"] = new_district
-
-                        # Smart merge value: combine existing city with new district
-                        if existing_city and new_district and new_district not in existing_value:
-                            updated["to_address"]["value"] = existing_city + new_district
-                        elif new_value and existing_value and len(new_value) < len(existing_value):
-                            if new_value not in existing_value:
-                                updated["to_address"]["value"] = existing_value + new_value
-                        elif new_value:
-                            updated["to_address"]["value"] = new_value
-                        elif existing_value:
-                            updated["to_address"]["value"] = existing_value
-
-                        # R2: to_address 需要 city 才能标记为 baseline
-                        if updated["to_address"].get("city"):
-                            updated["to_address"]["status"] = FieldStatus.BASELINE.value
-                        else:
-                            updated["to_address"]["status"] = FieldStatus.IN_PROGRESS.value
-                    else:
-                        # Simple value - check if adding to existing
-                        existing_value = updated["to_address"].get("value", "")
-                        new_value = extracted.parsed_value or ""
-                        if existing_value and "区" in str(new_value) and str(new_value) not in existing_value:
-                            updated["to_address"]["value"] = existing_value + str(new_value)
-                        elif new_value:
-                            updated["to_address"]["value"] = new_value
-                        if extracted.needs_verification:
-                            updated["to_address"]["status"] = FieldStatus.IN_PROGRESS.value
-                        else:
-                            updated["to_address"]["status"] = FieldStatus.BASELINE.value
-
-                elif field_name == "from_building_type":
-                    if "from_address" not in updated or not isinstance(updated["from_address"], dict):
-                        updated["from_address"] = {}
-                    updated["from_address"]["building_type"] = extracted.parsed_value
-
-                elif field_name == "move_date":
-                    if "move_date" not in updated or not isinstance(updated["move_date"], dict):
-                        updated["move_date"] = {}
-                    # Merge parsed value if it's a dict
-                    if isinstance(extracted.parsed_value, dict):
-                        for k, v in extracted.parsed_value.items():
-                            if v is not None:
-                                updated["move_date"][k] = v
-                    else:
-                        updated["move_date"]["value"] = extracted.parsed_value
-                    # R3: move_date needs year, month, AND day/period for baseline
-                    has_day_or_period = (
-                        updated["move_date"].get("day") is not None or
-                        updated["move_date"].get("period") is not None
-                    )
-                    if has_day_or_period and not extracted.needs_verification:
-                        updated["move_date"]["status"] = FieldStatus.BASELINE.value
-                    else:
-                        updated["move_date"]["status"] = FieldStatus.IN_PROGRESS.value
-
-                elif field_name == "move_time_slot":
-                    if "move_date" not in updated or not isinstance(updated["move_date"], dict):
-                        updated["move_date"] = {}
-                    updated["move_date"]["time_slot"] = extracted.parsed_value
-
-                elif field_name == "from_floor":
-                    if "from_floor_elevator" not in updated or not isinstance(updated["from_floor_elevator"], dict):
-                        updated["from_floor_elevator"] = {}
-                    updated["from_floor_elevator"]["floor"] = extracted.parsed_value
-                    # If we already have elevator info, mark as baseline
-                    if updated["from_floor_elevator"].get("has_elevator") is not None:
-                        updated["from_floor_elevator"]["status"] = FieldStatus.BASELINE.value
-                    else:
-                        updated["from_floor_elevator"]["status"] = FieldStatus.IN_PROGRESS.value
-
-                elif field_name == "from_has_elevator":
-                    if "from_floor_elevator" not in updated or not isinstance(updated["from_floor_elevator"], dict):
-                        updated["from_floor_elevator"] = {}
-                    updated["from_floor_elevator"]["has_elevator"] = extracted.parsed_value
-                    # If we already have floor info, mark as baseline
-                    if updated["from_floor_elevator"].get("floor") is not None:
-                        updated["from_floor_elevator"]["status"] = FieldStatus.BASELINE.value
-                    else:
-                        updated["from_floor_elevator"]["status"] = FieldStatus.IN_PROGRESS.value
-
-                elif field_name == "to_floor":
-                    if "to_floor_elevator" not in updated or not isinstance(updated["to_floor_elevator"], dict):
-                        updated["to_floor_elevator"] = {}
-                    updated["to_floor_elevator"]["floor"] = extracted.parsed_value
-                    if updated["to_floor_elevator"].get("has_elevator") is not None:
-                        updated["to_floor_elevator"]["status"] = FieldStatus.BASELINE.value
-                    else:
-                        updated["to_floor_elevator"]["status"] = FieldStatus.IN_PROGRESS.value
-
-                elif field_name == "to_has_elevator":
-                    if "to_floor_elevator" not in updated or not isinstance(updated["to_floor_elevator"], dict):
-                        updated["to_floor_elevator"] = {}
-                    updated["to_floor_elevator"]["has_elevator"] = extracted.parsed_value
-                    if updated["to_floor_elevator"].get("floor") is not None:
-                        updated["to_floor_elevator"]["status"] = FieldStatus.BASELINE.value
-                    else:
-                        updated["to_floor_elevator"]["status"] = FieldStatus.IN_PROGRESS.value
-
-                elif field_name == "packing_service":
-                    updated["packing_service"] = extracted.parsed_value
-
-                elif field_name == "special_notes":
-                    if "special_notes" not in updated:
-                        updated["special_notes"] = []
-                    # LLM 驱动：special_notes_done 由 intent.primary == "complete" 判断
-                    # 这里只添加实际的特殊需求
-                    if isinstance(extracted.parsed_value, list):
-                        for v in extracted.parsed_value:
-                            if v and v not in updated["special_notes"]:
-                                updated["special_notes"].append(v)
-                    else:
-                        if extracted.parsed_value and extracted.parsed_value not in updated["special_notes"]:
-                            updated["special_notes"].append(extracted.parsed_value)
+            if extracted.parsed_value is None:
+                continue
+            # Map field names to status structure; unknown fields are ignored
+            updater = _FIELD_UPDATERS.get(field_name)
+            if updater is not None:
+                updater(updated, extracted)
 
         return updated
 
+    def _remember(self, cache_key: Tuple[str, ...], output: RouterOutput) -> None:
+        """Store a copy of a parsed output, evicting the least recently used entries"""
+        cache = self._response_cache
+        cache[cache_key] = output.model_copy(deep=True)
+        cache.move_to_end(cache_key)
+        while len(cache) > settings.router_cache_size:
+            cache.popitem(last=False)
+
     def _get_fallback_output(
         self,
         user_message: str,
@@ -1,5 +1,6 @@
 import json
 import uuid
+import asyncio
 import logging
 from typing import Optional
 
@@ -197,14 +198,15 @@ async def get_or_create_session(session_token: Optional[str]) -> dict:
     redis_client = await get_redis()
 
     if session_token:
-        # Try to get existing session
-        session = await redis_client.get_session(session_token)
+        # Try to get existing session (with its cached messages, one round trip)
+        session, cached_messages = await redis_client.get_session_and_messages(session_token)
         if session:
             return {
                 "session_token": session_token,
                 "session_id": session.get("id"),
                 "current_phase": int(session.get("current_phase", 0)),
                 "fields_status": session.get("fields_status", get_default_fields()),
+                "cached_messages": cached_messages,
                 "is_new": False
             }
 
@@ -1234,19 +1236,20 @@ async def handle_session_reset(
             })
         await websocket.send_json({"type": "text_done"})
 
-        # Save welcome message first
-        await redis_client.add_message(
-            session["session_token"],
-            "assistant",
-            welcome_message
-        )
-
-        # Get smart options for opening - LLM根据欢迎消息上下文判断
-        smart_options = await get_smart_quick_options(
-            fields_status=new_fields,
-            recent_messages=[{"role": "assistant", "content": welcome_message}],
-            next_field=None,
-            context_hint="会话重置，Agent刚发送欢迎消息"
+        # Save welcome message and get smart options for opening concurrently
+        # 两者互不依赖：选项只基于传入的欢迎消息上下文判断
+        _, smart_options = await asyncio.gather(
+            redis_client.add_message(
+                session["session_token"],
+                "assistant",
+                welcome_message
+            ),
+            get_smart_quick_options(
+                fields_status=new_fields,
+                recent_messages=[{"role": "assistant", "content": welcome_message}],
+                next_field=None,
+                context_hint="会话重置，Agent刚发送欢迎消息"
+            )
         )
 
         # Send metadata
@@ -1312,15 +1315,15 @@ async def websocket_endpoint(
 
             await websocket.send_json({"type": "text_done"})
 
-            # Save welcome message first
-            await redis_client.add_message(token, "assistant", welcome_message)
-
-            # Get smart options for new session - LLM根据欢迎消息上下文判断
-            smart_options = await get_smart_quick_options(
-                fields_status=session["fields_status"],
-                recent_messages=[{"role": "assistant", "content": welcome_message}],
-                next_field=None,
-                context_hint="新会话开始，Agent刚发送欢迎消息"
+            # Save welcome message and get smart options for new session concurrently
+            _, smart_options = await asyncio.gather(
+                redis_client.add_message(token, "assistant", welcome_message),
+                get_smart_quick_options(
+                    fields_status=session["fields_status"],
+                    recent_messages=[{"role": "assistant", "content": welcome_message}],
+                    next_field=None,
+                    context_hint="新会话开始，Agent刚发送欢迎消息"
+                )
             )
 
             # Send initial metadata
@@ -1339,7 +1342,8 @@ async def websocket_endpoint(
 
         else:
             # Existing session - send previous messages and current state
-            cached_messages = await redis_client.get_messages(token)
+            # Messages were fetched together with the session
+            cached_messages = session.pop("cached_messages", [])
 
             # Send message history
             await websocket.send_json({
@@ -1357,7 +1361,9 @@ async def websocket_endpoint(
                 fields_status=session["fields_status"],
                 recent_messages=cached_messages[-6:],
                 next_field=completion_info.get("next_priority_field"),
-                context_hint="用户重新连接，根据最后一条Agent消息判断选项"
+                context_hint="用户重新连接，根据最后一条Agent消息判断选项",
+                phase=current_phase,
+                completion_info=completion_info
             )
 
             await websocket.send_json({
@@ -1,9 +1,18 @@
 """Phase Inference - 根据字段状态推断当前阶段"""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Tuple
 from app.models.fields import Phase, FieldStatus
 
 
+# 需要询问楼层电梯/户型的建筑类型（公寓类）
+APARTMENT_TYPES = frozenset({"マンション", "アパート", "タワーマンション", "団地", "ビル"})
+
+# 状态分组
+_SKIPPED_OR_DONE = frozenset({FieldStatus.BASELINE.value, FieldStatus.IDEAL.value, FieldStatus.SKIPPED.value})
+_ASKED_OR_DONE = _SKIPPED_OR_DONE | {FieldStatus.ASKED.value}
+_SKIPPED_OR_ASKED = frozenset({FieldStatus.SKIPPED.value, FieldStatus.ASKED.value})
+
+
 def get_skipped_fields(fields_status: Dict[str, Any]) -> List[str]:
     """
     获取所有SKIPPED状态的字段
@@ -12,12 +21,9 @@ def get_skipped_fields(fields_status: Dict[str, Any]) -> List[str]:
         SKIPPED字段名列表
     """
     skipped = []
-
-    # 需要询问楼层电梯的建筑类型（公寓类）
-    apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
     from_addr = fields_status.get("from_address", {})
     building_type = from_addr.get("building_type") if isinstance(from_addr, dict) else None
-    needs_floor_info = building_type in apartment_types if building_type else False
+    needs_floor_info = building_type in APARTMENT_TYPES if building_type else False
 
     # 检查 from_floor_elevator（只有公寓类建筑才检查）
     if needs_floor_info:
@@ -141,8 +147,7 @@ def infer_phase(fields_status: Dict[str, Any]) -> Phase:
             return Phase.ADDRESS  # 建筑类型未收集，停留在阶段2
 
         # 公寓类建筑需要户型信息
-        apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
-        if building_type in apartment_types:
+        if building_type in APARTMENT_TYPES:
             room_type = from_addr.get("room_type") if isinstance(from_addr, dict) else None
             if room_type is None:
                 return Phase.ADDRESS  # 户型未收集，停留在阶段2
@@ -165,9 +170,8 @@ def infer_phase(fields_status: Dict[str, Any]) -> Phase:
     # 注意：建筑类型和户型已在阶段2收集，这里只检查楼层电梯等信息
 
     # 判断是否需要询问楼层电梯（只有公寓类建筑需要）
-    apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
     building_type = from_addr.get("building_type") if isinstance(from_addr, dict) else None
-    needs_floor_info = building_type in apartment_types if building_type else False
+    needs_floor_info = building_type in APARTMENT_TYPES if building_type else False
 
     # 1. 检查搬出楼层电梯（只有公寓类建筑需要询问）
     if needs_floor_info:
@@ -205,118 +209,136 @@ def infer_phase(fields_status: Dict[str, Any]) -> Phase:
     return Phase.CONFIRMATION
 
 
-def get_next_priority_field(fields_status: Dict[str, Any]) -> Optional[str]:
-    """
-    获取下一个应该收集的字段
+def _field_status(fields_status: Dict[str, Any], name: str) -> str:
+    """读取 dict 型字段的 status（非 dict 或缺失视为未收集）"""
+    value = fields_status.get(name, {})
+    if isinstance(value, dict):
+        return value.get("status", FieldStatus.NOT_COLLECTED.value)
+    return FieldStatus.NOT_COLLECTED.value
 
-    按优先级顺序：
-    1. people_count
-    2. from_address
-    3. to_address
-    4. move_date
-    5. items
-    6. from_floor_elevator (公寓场景，必填)
-    7. to_floor_elevator (非必填，但要询问)
-    8. packing_service
-    9. special_notes (多选，用户点"没有了"结束)
-    """
 
-    def is_done(status: str) -> bool:
-        return status in [FieldStatus.BASELINE.value, FieldStatus.IDEAL.value]
+def _from_address_followups_apply(fields_status: Dict[str, Any]) -> bool:
+    """搬出地址被跳过/仅问过时，不再追问建筑类型和户型"""
+    return _field_status(fields_status, "from_address") not in _SKIPPED_OR_ASKED
 
-    def is_skipped_or_done(status: str) -> bool:
-        return status in [FieldStatus.BASELINE.value, FieldStatus.IDEAL.value, FieldStatus.SKIPPED.value]
 
-    def is_asked_or_done(status: str) -> bool:
-        """非必填字段：只要问过就不再返回（ASKED/SKIPPED/BASELINE/IDEAL）"""
-        return status in [FieldStatus.ASKED.value, FieldStatus.BASELINE.value, FieldStatus.IDEAL.value, FieldStatus.SKIPPED.value]
+def _from_building_type(fields_status: Dict[str, Any]) -> Optional[str]:
+    from_addr = fields_status.get("from_address", {})
+    return from_addr.get("building_type") if isinstance(from_addr, dict) else None
 
-    # 1. Check people_count - 人数可以跳过（用户明确说跳过才跳过）
-    people_status = fields_status.get("people_count_status", FieldStatus.NOT_COLLECTED.value)
-    if not is_skipped_or_done(people_status):
-        return "people_count"
 
-    # 2. Check from_address - 地址可以跳过（用户明确说跳过才跳过）
-    # ASKED 状态也跳过：用户已被问过，不再重复返回
+def _needs_room_type(fields_status: Dict[str, Any]) -> bool:
     from_addr = fields_status.get("from_address", {})
-    from_status = from_addr.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(from_addr, dict) else FieldStatus.NOT_COLLECTED.value
-    if not is_asked_or_done(from_status):
-        return "from_address"
+    room_type = from_addr.get("room_type") if isinstance(from_addr, dict) else None
+    return _from_building_type(fields_status) in APARTMENT_TYPES and room_type is None
 
-    # 2.1-2.2 建筑类型和户型：主要由 Router LLM 自主决定
-    # 这里作为后备逻辑，当 Router 未正确输出 guide_to_field 时使用
-    # 如果地址被跳过了，就不再追问建筑类型和户型
-    if from_status not in [FieldStatus.SKIPPED.value, FieldStatus.ASKED.value]:
-        building_type = from_addr.get("building_type") if isinstance(from_addr, dict) else None
-        apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
 
-        # 后备：如果搬出地址已确认但建筑类型未收集
-        if building_type is None:
-            return "from_building_type"
+def _special_notes_pending(fields_status: Dict[str, Any]) -> bool:
+    # 完成条件：已问过(ASKED) 或 用户说了"没有了" 或 已有内容
+    special_notes_list = fields_status.get("special_notes", [])
+    has_content = isinstance(special_notes_list, list) and len(special_notes_list) > 0
+    return (
+        fields_status.get("special_notes_status", FieldStatus.NOT_COLLECTED.value) not in _ASKED_OR_DONE
+        and not fields_status.get("special_notes_done", False)
+        and not has_content
+    )
 
-        # 后备：如果是公寓类建筑但户型未收集
-        if building_type in apartment_types:
-            room_type = from_addr.get("room_type") if isinstance(from_addr, dict) else None
-            if room_type is None:
-                return "from_room_type"
 
-    # 3. Check to_address - 地址可以跳过（用户明确说跳过才跳过）
-    # ASKED 状态也跳过：用户已被问过，不再重复返回
-    to_addr = fields_status.get("to_address", {})
-    to_status = to_addr.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(to_addr, dict) else FieldStatus.NOT_COLLECTED.value
-    if not is_asked_or_done(to_status):
-        return "to_address"
+# 字段收集优先级：(字段名, 该字段是否仍待收集)，按顺序返回第一个待收集的字段
+# 必填字段要求 SKIPPED/BASELINE/IDEAL；非必填字段问过(ASKED)即可
+PRIORITY_ORDER: Tuple[Tuple[str, Callable[[Dict[str, Any]], bool]], ...] = (
+    ("people_count",
+     lambda f: f.get("people_count_status", FieldStatus.NOT_COLLECTED.value) not in _SKIPPED_OR_DONE),
+    # 地址被问过(ASKED)就不再重复返回
+    ("from_address", lambda f: _field_status(f, "from_address") not in _ASKED_OR_DONE),
+    # 建筑类型和户型主要由 Router LLM 决定，这里作为后备
+    ("from_building_type",
+     lambda f: _from_address_followups_apply(f) and _from_building_type(f) is None),
+    ("from_room_type", lambda f: _from_address_followups_apply(f) and _needs_room_type(f)),
+    ("to_address", lambda f: _field_status(f, "to_address") not in _ASKED_OR_DONE),
+    ("move_date", lambda f: _field_status(f, "move_date") not in _SKIPPED_OR_DONE),
+    ("items", lambda f: _field_status(f, "items") not in _SKIPPED_OR_DONE),
+    # 只有公寓类建筑需要搬出楼层电梯（条件必填）
+    ("from_floor_elevator",
+     lambda f: _from_building_type(f) in APARTMENT_TYPES
+     and _field_status(f, "from_floor_elevator") not in _SKIPPED_OR_DONE),
+    ("to_floor_elevator", lambda f: _field_status(f, "to_floor_elevator") not in _ASKED_OR_DONE),
+    ("packing_service",
+     lambda f: f.get("packing_service_status", FieldStatus.NOT_COLLECTED.value) not in _ASKED_OR_DONE),
+    ("special_notes", _special_notes_pending),
+)
 
-    # 4. Check move_date - 日期可以跳过（用户明确说跳过才跳过）
-    move_date = fields_status.get("move_date", {})
-    date_status = move_date.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(move_date, dict) else FieldStatus.NOT_COLLECTED.value
-    if not is_skipped_or_done(date_status):
-        return "move_date"
 
-    # 5. Check items - 物品可以跳过（用户明确说跳过才跳过）
-    items = fields_status.get("items", {})
-    items_status = items.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(items, dict) else FieldStatus.NOT_COLLECTED.value
-    if not is_skipped_or_done(items_status):
-        return "items"
+def get_next_priority_field(fields_status: Dict[str, Any]) -> Optional[str]:
+    """
+    获取下一个应该收集的字段
 
-    # 6. 楼层电梯检查（建筑类型和户型已在阶段2收集）
-    # 获取建筑类型用于判断是否需要楼层电梯信息
-    apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
-    building_type = from_addr.get("building_type") if isinstance(from_addr, dict) else None
-    from_needs_floor = building_type in apartment_types if building_type else False
+    按 PRIORITY_ORDER 顺序返回第一个待收集的字段：
+    1. people_count
+    2. from_address（及后备的 from_building_type / from_room_type）
+    3. to_address
+    4. move_date
+    5. items
+    6. from_floor_elevator (公寓场景，必填)
+    7. to_floor_elevator (非必填，但要询问)
+    8. packing_service
+    9. special_notes (多选，用户点"没有了"结束)
 
-    # 6.1 Check from_floor_elevator (只有公寓类建筑需要询问，条件必填)
-    if from_needs_floor:
-        from_floor = fields_status.get("from_floor_elevator", {})
-        floor_status = from_floor.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(from_floor, dict) else FieldStatus.NOT_COLLECTED.value
-        if not is_skipped_or_done(floor_status):
-            return "from_floor_elevator"
+    ASKED 状态的字段不强制复查，确认阶段会显示未填写的字段
+    """
+    return next((name for name, pending in PRIORITY_ORDER if pending(fields_status)), None)
 
-    # 8. Check to_floor_elevator（非必填，问过即可跳过）
-    to_floor = fields_status.get("to_floor_elevator", {})
-    to_floor_status = to_floor.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(to_floor, dict) else FieldStatus.NOT_COLLECTED.value
-    if not is_asked_or_done(to_floor_status):
-        return "to_floor_elevator"
 
-    # 9. Check packing_service（非必填，问过即可跳过）
-    packing_status = fields_status.get("packing_service_status", FieldStatus.NOT_COLLECTED.value)
-    if not is_asked_or_done(packing_status):
-        return "packing_service"
+def _done(status: str) -> bool:
+    return status in (FieldStatus.BASELINE.value, FieldStatus.IDEAL.value)
 
-    # 10. Check special_notes（非必填，问过即可跳过）
-    special_notes_status = fields_status.get("special_notes_status", FieldStatus.NOT_COLLECTED.value)
-    special_notes_done = fields_status.get("special_notes_done", False)
-    special_notes_list = fields_status.get("special_notes", [])
-    has_content = isinstance(special_notes_list, list) and len(special_notes_list) > 0
 
-    if not is_asked_or_done(special_notes_status) and not special_notes_done and not has_content:
-        return "special_notes"
+def _from_floor_complete(fields_status: Dict[str, Any]) -> bool:
+    # 只有公寓类建筑需要询问；非公寓类自动完成，
+    # building_type 未知时暂不计入 missing_fields（等待 building_type 收集后再判断）
+    if _from_building_type(fields_status) not in APARTMENT_TYPES:
+        return True
+    return _field_status(fields_status, "from_floor_elevator") in _SKIPPED_OR_DONE
 
-    # 11. ASKED 状态的字段不强制复查，让流程更顺畅
-    # 确认阶段会显示未填写的字段，给用户二次机会
 
-    # All done
-    return None
+def _special_notes_complete(fields_status: Dict[str, Any]) -> bool:
+    # 有内容或用户说"没有了"都算完成
+    special_notes_list = fields_status.get("special_notes", [])
+    has_content = isinstance(special_notes_list, list) and len(special_notes_list) > 0
+    return bool(fields_status.get("special_notes_done", False)) or has_content
+
+
+# 提交前需要完成的字段：(字段名, 是否已完成)，第 i 项对应完成度位图的第 i 位
+COMPLETION_CHECKS: Tuple[Tuple[str, Callable[[Dict[str, Any]], bool]], ...] = (
+    # 阶段1-4的核心字段
+    ("people_count",
+     lambda f: _done(f.get("people_count_status", FieldStatus.NOT_COLLECTED.value))),
+    ("from_address", lambda f: _done(_field_status(f, "from_address"))),
+    ("to_address", lambda f: _done(_field_status(f, "to_address"))),
+    ("move_date", lambda f: _done(_field_status(f, "move_date"))),
+    ("items", lambda f: _done(_field_status(f, "items"))),
+    # 阶段2额外字段 - 搬出地址确认后追问；非公寓类建筑不需要户型
+    ("from_building_type", lambda f: _from_building_type(f) is not None),
+    ("from_room_type", lambda f: not _needs_room_type(f)),
+    # 阶段5字段
+    ("from_floor_elevator", _from_floor_complete),
+    # 非必填但要询问（搬入地址可能是不同类型的建筑，独立判断）
+    ("to_floor_elevator", lambda f: _field_status(f, "to_floor_elevator") in _SKIPPED_OR_DONE),
+    # 必须询问（可跳过）
+    ("packing_service",
+     lambda f: f.get("packing_service") is not None
+     or f.get("packing_service_status") == FieldStatus.SKIPPED.value),
+    ("special_notes", _special_notes_complete),
+)
+
+
+def completion_bits(fields_status: Dict[str, Any]) -> int:
+    """把 COMPLETION_CHECKS 的完成情况压成一个整数位图（第 i 位为 1 表示第 i 项已完成）"""
+    bits = 0
+    for i, (_, complete) in enumerate(COMPLETION_CHECKS):
+        if complete(fields_status):
+            bits |= 1 << i
+    return bits
 
 
 def get_completion_info(fields_status: Dict[str, Any]) -> Dict[str, Any]:
@@ -326,87 +348,10 @@ def get_completion_info(fields_status: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         dict with can_submit, completion_rate, missing_fields, next_priority_field
     """
-
-    def is_done(status: str) -> bool:
-        return status in [FieldStatus.BASELINE.value, FieldStatus.IDEAL.value]
-
-    def is_skipped_or_done(status: str) -> bool:
-        return status in [FieldStatus.BASELINE.value, FieldStatus.IDEAL.value, FieldStatus.SKIPPED.value]
-
-    # Required fields check - 阶段1-4的核心字段
-    required_checks = {
-        "people_count": is_done(fields_status.get("people_count_status", FieldStatus.NOT_COLLECTED.value)),
-        "from_address": is_done(
-            fields_status.get("from_address", {}).get("status", FieldStatus.NOT_COLLECTED.value)
-            if isinstance(fields_status.get("from_address"), dict) else FieldStatus.NOT_COLLECTED.value
-        ),
-        "to_address": is_done(
-            fields_status.get("to_address", {}).get("status", FieldStatus.NOT_COLLECTED.value)
-            if isinstance(fields_status.get("to_address"), dict) else FieldStatus.NOT_COLLECTED.value
-        ),
-        "move_date": is_done(
-            fields_status.get("move_date", {}).get("status", FieldStatus.NOT_COLLECTED.value)
-            if isinstance(fields_status.get("move_date"), dict) else FieldStatus.NOT_COLLECTED.value
-        ),
-        "items": is_done(
-            fields_status.get("items", {}).get("status", FieldStatus.NOT_COLLECTED.value)
-            if isinstance(fields_status.get("items"), dict) else FieldStatus.NOT_COLLECTED.value
-        ),
-    }
-
-    # 阶段2额外字段 - 搬出地址确认后追问
-    from_addr = fields_status.get("from_address", {})
-    apartment_types = ["マンション", "アパート", "タワーマンション", "団地", "ビル"]
-
-    # from_building_type - 搬出地址确认后必须询问
-    building_type = from_addr.get("building_type") if isinstance(from_addr, dict) else None
-    required_checks["from_building_type"] = building_type is not None
-
-    # from_room_type - 公寓类建筑需要询问户型
-    if building_type in apartment_types:
-        room_type = from_addr.get("room_type") if isinstance(from_addr, dict) else None
-        required_checks["from_room_type"] = room_type is not None
-    else:
-        required_checks["from_room_type"] = True  # 非公寓类建筑不需要户型
-
-    # 阶段5字段 - 楼层电梯等
-    # 判断是否需要询问楼层电梯（只有公寓类建筑需要）
-    needs_floor_info = building_type in apartment_types if building_type else None  # None = 未知
-
-    # from_floor_elevator - 只有公寓类建筑需要询问
-    if needs_floor_info is True:
-        # 确定是公寓类建筑，需要询问
-        from_floor = fields_status.get("from_floor_elevator", {})
-        floor_status = from_floor.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(from_floor, dict) else FieldStatus.NOT_COLLECTED.value
-        required_checks["from_floor_elevator"] = is_skipped_or_done(floor_status)
-    elif needs_floor_info is False:
-        # 确定不是公寓类建筑（戸建て等），自动完成
-        required_checks["from_floor_elevator"] = True
-    else:
-        # building_type 未知，暂不计入 missing_fields（等待 building_type 收集后再判断）
-        required_checks["from_floor_elevator"] = True  # 暂时标记为完成，避免重复计入
-
-    # to_floor_elevator - 非必填，但要询问（独立于搬出地址的建筑类型）
-    # 因为搬入地址可能是不同类型的建筑
-    to_floor = fields_status.get("to_floor_elevator", {})
-    to_floor_status = to_floor.get("status", FieldStatus.NOT_COLLECTED.value) if isinstance(to_floor, dict) else FieldStatus.NOT_COLLECTED.value
-    required_checks["to_floor_elevator"] = is_skipped_or_done(to_floor_status)
-
-    # packing_service - 必须询问（可跳过）
-    packing_status = fields_status.get("packing_service_status", FieldStatus.NOT_COLLECTED.value)
-    packing_value = fields_status.get("packing_service")
-    required_checks["packing_service"] = packing_value is not None or packing_status == FieldStatus.SKIPPED.value
-
-    # special_notes - 有内容或用户说"没有了"都算完成
-    special_notes_done = fields_status.get("special_notes_done", False)
-    special_notes_list = fields_status.get("special_notes", [])
-    has_content = isinstance(special_notes_list, list) and len(special_notes_list) > 0
-    required_checks["special_notes"] = special_notes_done or has_content
-
-    # Calculate stats
-    total = len(required_checks)
-    completed = sum(1 for v in required_checks.values() if v)
-    missing = [k for k, v in required_checks.items() if not v]
+    bits = completion_bits(fields_status)
+    total = len(COMPLETION_CHECKS)
+    completed = bits.bit_count()
+    missing = [name for i, (name, _) in enumerate(COMPLETION_CHECKS) if not bits >> i & 1]
 
     return {
         "can_submit": completed == total,
@@ -418,6 +363,11 @@ def get_completion_info(fields_status: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# 固定快捷选项（模块加载时构建一次，返回时复制为 list）
+OPENING_OPTIONS = ("获取搬家报价", "咨询搬家问题", "了解服务内容")
+SPECIAL_NOTES_OPTIONS = ("有宜家家具", "有钢琴需要搬运", "空调安装", "空调拆卸", "不用品回收", "没有了")
+
+
 def get_quick_options_for_phase(
     phase: Phase,
     fields_status: Dict[str, Any],
@@ -444,14 +394,13 @@ def get_quick_options_for_phase(
 
     # 开场白 - 固定选项（介绍能做什么）
     if phase == Phase.OPENING:
-        return ["获取搬家报价", "咨询搬家问题", "了解服务内容"]
+        return list(OPENING_OPTIONS)
 
     # 特殊注意事项 - 固定选项（业务规定的5个服务）
     if phase == Phase.OTHER_INFO:
         if context.get("asking_special_notes"):
-            all_options = ["有宜家家具", "有钢琴需要搬运", "空调安装", "空调拆卸", "不用品回收", "没有了"]
             selected = fields_status.get("special_notes", [])
-            return [opt for opt in all_options if opt not in selected]
+            return [opt for opt in SPECIAL_NOTES_OPTIONS if opt not in selected]
 
     # 其他情况返回空，让LLM自主决定是否提供选项以及提供什么选项
     return []
@@ -13,7 +13,7 @@ State Machine - 基于 Intent 的状态转换规则
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 
-from app.models.fields import FieldStatus
+from app.models.fields import FieldStatus, Phase
 
 logger = logging.getLogger(__name__)
 
@@ -260,7 +260,7 @@ def process_intent_transitions(
         # 完成意图：根据当前阶段决定完成什么
         current_phase = context.get("current_phase", 0)
 
-        if current_phase == 4:
+        if current_phase == Phase.ITEMS:
             # 阶段4：物品收集完成
             items_state = fields_status.get("items", {})
             if not isinstance(items_state, dict):
@@ -273,7 +273,7 @@ def process_intent_transitions(
                 fields_status["items"] = new_state
                 updated_fields.append("items")
 
-        elif current_phase == 5:
+        elif current_phase == Phase.OTHER_INFO:
             # 阶段5：特殊注意事项完成
             new_state, fields_status, matched = apply_state_transition(
                 "special_notes", {}, intent, fields_status
@@ -9,13 +9,14 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
+from functools import cache
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
-    """Validation result"""
+    """Validation result (mutable: collector refines address results in place)"""
     is_valid: bool
     parsed_value: Any
     status: str  # "baseline" | "ideal" | "needs_verification" | "invalid"
@@ -31,13 +32,31 @@ class FieldValidator:
     """Field validation logic - simple checks only, no parsing"""
 
     # Japanese building types
-    BUILDING_TYPES = {
+    BUILDING_TYPES = frozenset({
         "マンション", "アパート", "戸建て", "タワーマンション",
         "その他", "公共の建物", "一戸建て", "ビル", "団地"
-    }
+    })
 
     # Apartment types that require floor info
-    APARTMENT_TYPES = {"マンション", "アパート", "タワーマンション", "団地", "ビル"}
+    APARTMENT_TYPES = frozenset({"マンション", "アパート", "タワーマンション", "団地", "ビル"})
+
+    # Floor suffixes the user may type after the number ("5F", "5階", "5楼")
+    FLOOR_SUFFIXES = "階FfＦ楼层"
+
+    # Time slot aliases normalized to the canonical option text
+    TIME_SLOT_ALIASES = {
+        "午前": "上午",
+        "午後": "下午",
+        "morning": "上午",
+        "afternoon": "下午",
+    }
+
+    # Elevator yes/no vocabularies (compared after strip + lower)
+    ELEVATOR_YES = frozenset({"有电梯", "有", "あり", "有り", "yes", "true", "はい"})
+    ELEVATOR_NO = frozenset({"无电梯", "没有", "没有电梯", "无", "なし", "無し", "no", "false", "いいえ"})
+
+    # Elevator answers meaning "not sure yet"
+    UNKNOWN_ELEVATOR_VALUES = frozenset({"还不清楚", "不清楚", "不确定"})
 
     def validate_people_count(self, value: Any) -> ValidationResult:
         """
@@ -310,6 +329,7 @@ class FieldValidator:
             )
 
         value_str = str(value).strip()
+        value_str = self.TIME_SLOT_ALIASES.get(value_str.lower(), value_str)
 
         return ValidationResult(
             is_valid=True,
@@ -344,6 +364,12 @@ class FieldValidator:
                 message=f"{value}楼"
             )
 
+        # Plain number with an optional floor suffix: treat as int
+        if isinstance(value, str):
+            number = value.strip().rstrip(self.FLOOR_SUFFIXES).strip()
+            if number.isdecimal():
+                return self.validate_floor(int(number))
+
         # Accept string as-is if Router didn't convert
         if isinstance(value, str) and value.strip():
             return ValidationResult(
@@ -382,8 +408,17 @@ class FieldValidator:
         # Accept string as-is
         if isinstance(value, str):
             value_str = value.strip()
+            normalized = value_str.lower()
+            if normalized in self.ELEVATOR_YES or normalized in self.ELEVATOR_NO:
+                has_elevator = normalized in self.ELEVATOR_YES
+                return ValidationResult(
+                    is_valid=True,
+                    parsed_value=has_elevator,
+                    status="ideal",
+                    message="有电梯" if has_elevator else "无电梯"
+                )
             # 处理 "还不清楚" 的情况 - 标记为 skipped
-            if value_str in ["还不清楚", "不清楚", "不确定"]:
+            if value_str in self.UNKNOWN_ELEVATOR_VALUES:
                 return ValidationResult(
                     is_valid=True,
                     parsed_value=value_str,
@@ -465,18 +500,13 @@ class FieldValidator:
             message=f"已添加{len(items_list)}件物品"
         )
 
-    def requires_floor_info(self, building_type: str) -> bool:
+    def requires_floor_info(self, building_type: Optional[str]) -> bool:
         """Check if building type requires floor info (Red Line R5)"""
         return building_type in self.APARTMENT_TYPES
 
 
-# Global validator instance
-_validator: Optional[FieldValidator] = None
-
-
+# Global validator instance (built on first use, then cached)
+@cache
 def get_field_validator() -> FieldValidator:
     """Get global field validator instance"""
-    global _validator
-    if _validator is None:
-        _validator = FieldValidator()
-    return _validator
+    return FieldValidator()
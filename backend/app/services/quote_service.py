@@ -15,6 +15,18 @@ from app.storage.postgres_client import get_db_context
 logger = logging.getLogger(__name__)
 
 
+def _quote_entry(data: Any) -> Optional[Dict[str, Any]]:
+    """Stored form of one field, or None when the field has no value (0 counts as a value)"""
+    if isinstance(data, dict):
+        value = data.get("value")
+        if value is None or value == "":
+            return None
+        return {"value": value, "confirmed": data.get("confirmed", False)}
+    if data is None or data == "":
+        return None
+    return {"value": data, "confirmed": True}
+
+
 class QuoteService:
     """Service for managing moving quotes"""
 
@@ -39,8 +51,8 @@ class QuoteService:
         """
         # Prepare quote data
         quote_id = str(uuid.uuid4())
-        collected_data = QuoteService._prepare_quote_data(fields_status)
         created_at = datetime.utcnow()
+        collected_data = QuoteService._prepare_quote_data(fields_status, created_at)
 
         # Try to save to database, but don't fail if DB is unavailable
         try:
@@ -112,25 +124,21 @@ class QuoteService:
         return user
 
     @staticmethod
-    def _prepare_quote_data(fields_status: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare and validate quote data for storage"""
+    def _prepare_quote_data(
+        fields_status: Dict[str, Any],
+        submitted_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Prepare and validate quote data for storage (submitted_at defaults to now)"""
         # Extract only filled values
-        prepared = {}
-
-        for field, data in fields_status.items():
-            if isinstance(data, dict):
-                value = data.get("value")
-                if value is not None and value != "":
-                    prepared[field] = {
-                        "value": value,
-                        "confirmed": data.get("confirmed", False)
-                    }
-            elif data is not None and data != "":
-                prepared[field] = {"value": data, "confirmed": True}
+        prepared = {
+            field: entry
+            for field, data in fields_status.items()
+            if (entry := _quote_entry(data)) is not None
+        }
 
         # Add metadata
         prepared["_meta"] = {
-            "submitted_at": datetime.utcnow().isoformat(),
+            "submitted_at": (submitted_at or datetime.utcnow()).isoformat(),
             "version": "1.0"
         }
 
@@ -2,9 +2,16 @@
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union, Callable
 
 from app.core import get_llm_client
+from app.core.phase_inference import (
+    infer_phase,
+    get_completion_info,
+    OPENING_OPTIONS,
+    SPECIAL_NOTES_OPTIONS
+)
+from app.models.fields import Phase
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +50,83 @@ SMART_OPTIONS_PROMPT = """根据对话上下文，判断是否需要显示快捷
 {{"options": ["选项1", "选项2"]}} 或 {{"options": []}}"""
 
 
+# === 固定选项规则表 ===
+# 开场和特殊注意事项选项与 phase_inference 共用同一份定义
+CONFIRMATION_OPTIONS = ("确认无误，发送报价", "需要修改")
+
+
+def _special_notes_options(fields_status: Dict[str, Any]) -> List[str]:
+    """阶段5特殊注意事项：6个固定选项，动态过滤已选的"""
+    selected = fields_status.get("special_notes", [])
+    if not isinstance(selected, list):
+        selected = []
+    return [opt for opt in SPECIAL_NOTES_OPTIONS if opt not in selected]
+
+
+def _items_options(fields_status: Dict[str, Any]) -> List[str]:
+    """物品收集阶段：没有物品时不显示快捷选项，让用户使用上传图片或从目录选择"""
+    items = fields_status.get("items", {})
+    if isinstance(items, dict) and items.get("list"):
+        return ["继续添加", "没有其他行李了"]
+    return []
+
+
+def _move_date_options(fields_status: Dict[str, Any]) -> List[str]:
+    """日期字段：按已收集的部分决定询问时段、时间或月份"""
+    move_date = fields_status.get("move_date", {})
+    if isinstance(move_date, dict):
+        # 如果已有月份，询问时段
+        if move_date.get("month") and not move_date.get("period") and not move_date.get("day"):
+            return ["上旬", "中旬", "下旬"]
+        # 如果已有日期，询问时间
+        if move_date.get("value") and not move_date.get("time_slot"):
+            return ["上午", "下午", "没有指定"]
+    # 默认：询问月份
+    return ["这个月", "下个月", "再下个月"]
+
+
+# next_field -> 固定选项（tuple）或依赖 fields_status 的选项函数
+FIELD_OPTION_RULES: Dict[str, Union[Tuple[str, ...], Callable[[Dict[str, Any]], List[str]]]] = {
+    "people_count": ("单身", "2~3人", "4人以上"),
+    "from_building_type": ("マンション", "アパート", "戸建て", "タワーマンション", "その他", "公共の建物"),
+    "from_room_type": ("1R/1K", "1DK/1LDK", "2DK/2LDK", "3LDK以上"),
+    "from_floor_elevator": ("有电梯", "无电梯"),
+    "to_floor_elevator": ("有电梯", "无电梯", "还不清楚"),  # 搬入地址包含"还不清楚"
+    "packing_service": ("全部请公司打包", "自己打包"),
+    # 地址字段：不显示快捷选项，让用户直接输入
+    "from_address": (),
+    "to_address": (),
+    "special_notes": _special_notes_options,
+    "items": _items_options,
+    "move_date": _move_date_options,
+}
+
+
+def match_field_options(
+    next_field: Optional[str],
+    fields_status: Dict[str, Any]
+) -> Optional[List[str]]:
+    """
+    Look up fixed options for the field being asked
+
+    Returns:
+        Option list, or None if next_field has no rule
+    """
+    rule = FIELD_OPTION_RULES.get(next_field)
+    if rule is None:
+        return None
+    if callable(rule):
+        return rule(fields_status)
+    return list(rule)
+
+
 async def get_smart_quick_options(
     fields_status: Dict[str, Any],
     recent_messages: List[Dict[str, Any]] = None,
     next_field: Optional[str] = None,
-    context_hint: Optional[str] = None
+    context_hint: Optional[str] = None,
+    phase: Optional[Phase] = None,
+    completion_info: Optional[Dict[str, Any]] = None
 ) -> List[str]:
     """
     Use LLM to intelligently decide quick options based on context.
@@ -57,6 +136,8 @@ async def get_smart_quick_options(
         recent_messages: Recent conversation history
         next_field: Next field to collect (optional hint)
         context_hint: Additional context hint (e.g., "items_just_confirmed")
+        phase: Phase already inferred by the caller (skips infer_phase)
+        completion_info: Completion info already computed by the caller
 
     Returns:
         List of quick option strings, or empty list if no options needed
@@ -68,78 +149,22 @@ async def get_smart_quick_options(
 
     # 0. 首先检查是否是 OPENING 阶段（所有字段都未收集）
     # 这个优先级最高，因为开场白应该显示介绍性选项而不是直接问人数
-    from app.core.phase_inference import infer_phase
-    from app.models.fields import Phase
-
-    current_phase = infer_phase(fields_status)
+    # 调用方已计算过 phase 时直接复用
+    current_phase = phase if phase is not None else infer_phase(fields_status)
     if current_phase == Phase.OPENING:
-        return ["获取搬家报价", "咨询搬家问题", "了解服务内容"]
-
-    # 1. 然后根据 next_field 判断（最准确，代表当前正在询问的字段）
-    # 人数：固定选项
-    if next_field == "people_count":
-        return ["单身", "2~3人", "4人以上"]
-
-    # 搬出地址建筑类型：固定选项（6个）
-    if next_field == "from_building_type":
-        return ["マンション", "アパート", "戸建て", "タワーマンション", "その他", "公共の建物"]
-
-    # 搬出地址户型：固定选项
-    if next_field == "from_room_type":
-        return ["1R/1K", "1DK/1LDK", "2DK/2LDK", "3LDK以上"]
-
-    # 搬出楼层电梯：固定选项
-    if next_field == "from_floor_elevator":
-        return ["有电梯", "无电梯"]
-
-    # 搬入楼层电梯：固定选项（包含"还不清楚"）
-    if next_field == "to_floor_elevator":
-        return ["有电梯", "无电梯", "还不清楚"]
-
-    # 打包服务：固定选项
-    if next_field == "packing_service":
-        return ["全部请公司打包", "自己打包"]
-
-    # 阶段5特殊注意事项：6个固定选项，动态过滤已选的
-    if next_field == "special_notes":
-        all_options = ["有宜家家具", "有钢琴需要搬运", "空调安装", "空调拆卸", "不用品回收", "没有了"]
-        selected = fields_status.get("special_notes", [])
-        if not isinstance(selected, list):
-            selected = []
-        return [opt for opt in all_options if opt not in selected]
-
-    # 物品收集阶段
-    if next_field == "items":
-        items = fields_status.get("items", {})
-        if isinstance(items, dict) and items.get("list"):
-            return ["继续添加", "没有其他行李了"]
-        # 没有物品时不显示快捷选项，让用户使用上传图片或从目录选择
-        return []
+        return list(OPENING_OPTIONS)
 
-    # 地址字段：不显示快捷选项，让用户直接输入
-    if next_field in ["from_address", "to_address"]:
-        return []
-
-    # 日期字段：显示月份选项
-    if next_field == "move_date":
-        move_date = fields_status.get("move_date", {})
-        if isinstance(move_date, dict):
-            # 如果已有月份，询问时段
-            if move_date.get("month") and not move_date.get("period") and not move_date.get("day"):
-                return ["上旬", "中旬", "下旬"]
-            # 如果已有日期，询问时间
-            if move_date.get("value") and not move_date.get("time_slot"):
-                return ["上午", "下午", "没有指定"]
-        # 默认：询问月份
-        return ["这个月", "下个月", "再下个月"]
+    # 1. 然后根据 next_field 查表（最准确，代表当前正在询问的字段）
+    options = match_field_options(next_field, fields_status)
+    if options is not None:
+        return options
 
     # 2. 然后根据阶段判断（当 next_field 没有匹配时）
-    from app.core.phase_inference import get_completion_info
-
     # 阶段6确认阶段：如果用户还未确认，显示确认相关选项
-    completion_info = get_completion_info(fields_status)
+    if completion_info is None:
+        completion_info = get_completion_info(fields_status)
     if completion_info["can_submit"] and not fields_status.get("user_confirmed_submit"):
-        return ["确认无误，发送报价", "需要修改"]
+        return list(CONFIRMATION_OPTIONS)
 
     # === 3. 其他场景：返回空选项（避免额外 LLM 调用以加快响应） ===
     # 性能优化：不再为未知场景调用 LLM，直接返回空选项
@@ -1,9 +1,10 @@
 """In-memory storage client for development without Redis/PostgreSQL"""
 
 import json
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from collections import defaultdict
+import time
+from typing import Optional, List, Dict, Any, Tuple
+from collections import defaultdict, deque
+from itertools import islice
 
 
 class MemoryClient:
@@ -11,7 +12,7 @@ class MemoryClient:
 
     def __init__(self):
         self._sessions: Dict[str, Dict[str, Any]] = {}
-        self._messages: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._messages: Dict[str, deque] = defaultdict(lambda: deque(maxlen=20))
         self._rate_limits: Dict[str, int] = {}
         self._privacy_shown: set = set()
         self.session_ttl = 24 * 3600
@@ -34,6 +35,15 @@ class MemoryClient:
         """Get session data from memory"""
         return self._sessions.get(f"session:{session_token}")
 
+    async def get_session_and_messages(
+        self,
+        session_token: str,
+        limit: int = None
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get session data and cached messages together"""
+        session = await self.get_session(session_token)
+        return session, await self.get_messages(session_token, limit)
+
     async def set_session(
         self,
         session_token: str,
@@ -50,7 +60,7 @@ class MemoryClient:
             "current_phase": current_phase,
             "fields_status": fields_status,
             "context": context or {},
-            "last_activity": int(datetime.utcnow().timestamp())
+            "last_activity": int(time.time())
         }
         if user_id:
             data["user_id"] = user_id
@@ -88,11 +98,10 @@ class MemoryClient:
             "role": role,
             "content": content,
             "metadata": metadata,
-            "ts": int(datetime.utcnow().timestamp())
+            "ts": int(time.time())
         }
-        self._messages[key].insert(0, message)
-        # Keep only recent messages
-        self._messages[key] = self._messages[key][:20]
+        # Newest first; deque(maxlen) drops the oldest message automatically
+        self._messages[key].appendleft(message)
 
     async def get_messages(
         self,
@@ -101,9 +110,13 @@ class MemoryClient:
     ) -> List[Dict[str, Any]]:
         """Get cached messages"""
         key = f"session:{session_token}:messages"
-        messages = self._messages.get(key, [])
+        messages = self._messages.get(key)
+        if not messages:
+            return []
         limit = limit or 20
-        return list(reversed(messages[:limit]))
+        recent = list(islice(messages, limit))
+        recent.reverse()
+        return recent
 
     # ============ Rate Limiting ============
 
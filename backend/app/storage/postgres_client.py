@@ -9,10 +9,20 @@ from app.models.database import Base
 
 
 # Create async engine
+# 显式设置连接池大小（默认 5/10 在 WebSocket 并发下会成为瓶颈）
+# asyncpg 语句缓存让每轮重复执行的 session/message 查询复用 prepared statement
 engine = create_async_engine(
     settings.database_url,
     echo=settings.env == "development",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=1800,
     pool_pre_ping=True,
+    pool_timeout=10,
+    connect_args={
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 256,
+    },
 )
 
 # Create async session factory
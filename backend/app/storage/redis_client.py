@@ -1,18 +1,27 @@
 import json
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import time
+from typing import Optional, List, Dict, Any, Tuple
 
 import redis.asyncio as redis
 
 from app.config import settings
 
 
+# INCR + 首次设置 TTL 在服务端原子执行，避免 INCR 后 EXPIRE 未到达导致 key 永不过期
+RATE_LIMIT_SCRIPT = """
+local c = redis.call('INCR', KEYS[1])
+if c == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1]) end
+return c
+"""
+
+
 class RedisClient:
     """Redis client for session caching"""
 
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
         self.session_ttl = settings.session_ttl_hours * 3600
+        self._rate_limit_script = None
 
     async def connect(self):
         """Connect to Redis"""
@@ -21,6 +30,8 @@ class RedisClient:
             encoding="utf-8",
             decode_responses=True
         )
+        # EVALSHA with automatic SCRIPT LOAD on NOSCRIPT
+        self._rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
 
     async def disconnect(self):
         """Disconnect from Redis"""
@@ -43,6 +54,11 @@ class RedisClient:
         """Get session data from Redis"""
         key = f"session:{session_token}"
         data = await self.redis.hgetall(key)
+        return self._parse_session(data)
+
+    @staticmethod
+    def _parse_session(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Decode JSON fields of a raw session hash"""
         if not data:
             return None
 
@@ -54,6 +70,20 @@ class RedisClient:
 
         return data
 
+    async def get_session_and_messages(
+        self,
+        session_token: str,
+        limit: int = None
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get session data and cached messages in one round trip"""
+        limit = limit or settings.max_messages_cached
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(f"session:{session_token}")
+            pipe.lrange(f"session:{session_token}:messages", 0, limit - 1)
+            data, messages = await pipe.execute()
+        # Reverse to get chronological order
+        return self._parse_session(data), [json.loads(m) for m in reversed(messages)]
+
     async def set_session(
         self,
         session_token: str,
@@ -70,7 +100,7 @@ class RedisClient:
             "current_phase": str(current_phase),
             "fields_status": json.dumps(fields_status),
             "context": json.dumps(context or {}),
-            "last_activity": str(int(datetime.utcnow().timestamp()))
+            "last_activity": str(int(time.time()))
         }
         if user_id:
             data["user_id"] = user_id
@@ -110,7 +140,7 @@ class RedisClient:
             "role": role,
             "content": content,
             "metadata": metadata,
-            "ts": int(datetime.utcnow().timestamp())
+            "ts": int(time.time())
         }
         await self.redis.lpush(key, json.dumps(message))
         # Keep only recent messages
@@ -134,9 +164,7 @@ class RedisClient:
     async def check_rate_limit(self, session_token: str) -> bool:
         """Check if session is rate limited"""
         key = f"ratelimit:{session_token}"
-        count = await self.redis.incr(key)
-        if count == 1:
-            await self.redis.expire(key, 60)
+        count = await self._rate_limit_script(keys=[key], args=[60])
         return count <= settings.rate_limit_per_minute
 
     # ============ Privacy Modal Flag ============
@@ -4,20 +4,24 @@ from app.utils.parser import (
     extract_json_from_text,
     safe_parse_json,
     parse_router_output,
+    parse_router_output_stream,
     parse_intent,
     parse_emotion,
     parse_extracted_fields,
     parse_next_actions,
-    parse_response_strategy
+    parse_response_strategy,
+    ParsedRouterOutput
 )
 
 __all__ = [
     "extract_json_from_text",
     "safe_parse_json",
     "parse_router_output",
+    "parse_router_output_stream",
     "parse_intent",
     "parse_emotion",
     "parse_extracted_fields",
     "parse_next_actions",
-    "parse_response_strategy"
+    "parse_response_strategy",
+    "ParsedRouterOutput"
 ]
@@ -1,59 +1,169 @@
 """Output parsing utilities with error tolerance"""
 
 import json
-import re
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, TypedDict
 
 logger = logging.getLogger(__name__)
 
+# Whitelists for validating router output (built once at import)
+_VALID_INTENTS = frozenset({
+    "provide_info", "modify_info", "confirm", "reject", "skip", "complete",
+    "ask_price", "ask_process", "ask_company", "ask_tips", "ask_general",
+    "express_anxiety", "express_confusion", "express_urgency", "express_frustration", "chitchat",
+    "go_back", "start_over", "request_summary", "request_quote"
+})
+_VALID_EMOTIONS = frozenset({"neutral", "positive", "anxious", "confused", "frustrated", "urgent"})
+_VALID_FIELDS = frozenset({
+    "people_count", "from_address", "to_address", "from_building_type", "to_building_type",
+    "move_date", "move_time_slot", "from_floor", "from_has_elevator",
+    "to_floor", "to_has_elevator", "packing_service", "special_notes"
+})
+_VALID_ACTIONS = frozenset({"update_field", "call_tool", "collect_field", "answer_question", "handle_emotion"})
+_VALID_AGENTS = frozenset({"collector", "advisor", "companion"})
+_VALID_STYLES = frozenset({"friendly", "professional", "empathetic", "concise"})
+
+# json.loads 能接受的首字符（含 NaN / Infinity），其余开头直接跳过整体解析
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
+
+
+class ParsedIntent(TypedDict):
+    primary: str
+    secondary: Optional[str]
+    confidence: float
+
+
+class ParsedField(TypedDict):
+    raw_value: str
+    parsed_value: Any
+    needs_verification: bool
+    confidence: float
+
+
+class ParsedAction(TypedDict):
+    type: str
+    target: Optional[str]
+    params: Dict[str, Any]
+    priority: int
+
+
+class ParsedStrategy(TypedDict):
+    agent_type: str
+    style: str
+    should_acknowledge: bool
+    guide_to_field: Optional[str]
+    include_options: bool
+
+
+class ParsedRouterOutput(TypedDict):
+    """Shape of parse_router_output results (plain dicts at runtime)"""
+    intent: ParsedIntent
+    extracted_fields: Dict[str, ParsedField]
+    user_emotion: str
+    current_phase: int
+    next_actions: List[ParsedAction]
+    response_strategy: ParsedStrategy
+
+
+def _iter_code_blocks(text: str) -> Iterator[str]:
+    """Yield the contents of ``` fenced blocks (an optional json tag is dropped)"""
+    _, fence, rest = text.partition("```")
+    while fence:
+        block, fence, rest = rest.partition("```")
+        if not fence:
+            return
+        block = block.lstrip()
+        if block[:4].lower() == "json":
+            block = block[4:]
+        yield block.strip()
+        _, fence, rest = rest.partition("```")
+
+
+def _scan_json_object(text: str, start: int) -> int:
+    """
+    Walk from the "{" at start to its matching "}"
 
-def extract_json_from_text(text: str) -> Optional[str]:
+    Braces inside JSON strings are ignored.
+
+    Returns:
+        Index just past the closing brace, or -1 if the object never closes
     """
-    Extract JSON from text that may contain other content
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _locate_json(text: str) -> Optional[Tuple[str, Any]]:
+    """
+    Find the JSON payload in text and decode it once
 
-    Handles cases like:
-    - Pure JSON
-    - JSON wrapped in markdown code blocks
-    - JSON with leading/trailing text
+    Returns:
+        (json_text, parsed_value), or None if no valid JSON is found
     """
+    text = (text or "").strip()
     if not text:
         return None
 
-    text = text.strip()
-
-    # Try to parse as-is first
-    try:
-        json.loads(text)
-        return text
-    except json.JSONDecodeError:
-        pass
-
-    # Try to extract from markdown code block
-    code_block_pattern = r'```(?:json)?\s*([\s\S]*?)```'
-    matches = re.findall(code_block_pattern, text)
-    for match in matches:
+    # Try to parse as-is first; plain prose is skipped without raising
+    if text[0] in _JSON_START_CHARS:
         try:
-            json.loads(match.strip())
-            return match.strip()
+            return text, json.loads(text)
         except json.JSONDecodeError:
-            continue
-
-    # Try to find JSON object pattern
-    json_pattern = r'\{[\s\S]*\}'
-    matches = re.findall(json_pattern, text)
+            pass
 
-    # Try each match, starting from the longest
-    for match in sorted(matches, key=len, reverse=True):
+    # Try to extract from markdown code block
+    for block in _iter_code_blocks(text):
         try:
-            json.loads(match)
-            return match
+            return block, json.loads(block)
         except json.JSONDecodeError:
             continue
 
+    # Try each balanced {...} object, starting from the first "{"
+    start = text.find("{")
+    while start >= 0:
+        end = _scan_json_object(text, start)
+        if end > 0:
+            candidate = text[start:end]
+            try:
+                return candidate, json.loads(candidate)
+            except json.JSONDecodeError:
+                pass
+        start = text.find("{", start + 1)
+
     return None
 
 
+def extract_json_from_text(text: str) -> Optional[str]:
+    """
+    Extract JSON from text that may contain other content
+
+    Handles cases like:
+    - Pure JSON
+    - JSON wrapped in markdown code blocks
+    - JSON with leading/trailing text
+    """
+    located = _locate_json(text)
+    return located[0] if located else None
+
+
 def safe_parse_json(text: str, default: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Safely parse JSON with fallback to default
@@ -68,37 +178,25 @@ def safe_parse_json(text: str, default: Dict[str, Any] = None) -> Dict[str, Any]
     if default is None:
         default = {}
 
-    extracted = extract_json_from_text(text)
-    if extracted is None:
-        logger.warning(f"Could not extract JSON from: {text[:200]}...")
-        return default
-
-    try:
-        return json.loads(extracted)
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parse error: {e}")
+    # The payload is decoded while locating it, no second json.loads needed
+    located = _locate_json(text)
+    if located is None:
+        logger.warning(f"Could not extract JSON from: {(text or '')[:200]}...")
         return default
 
+    return located[1]
 
-def parse_intent(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse and validate intent data"""
-    valid_intents = {
-        "provide_info", "modify_info", "confirm", "reject", "skip", "complete",
-        "ask_price", "ask_process", "ask_company", "ask_tips", "ask_general",
-        "express_anxiety", "express_confusion", "express_urgency", "express_frustration", "chitchat",
-        "go_back", "start_over", "request_summary", "request_quote"
-    }
-
-    intent = data.get("intent", {})
 
+def _parse_intent(intent: Dict[str, Any]) -> ParsedIntent:
+    """Validate the intent section"""
     # Validate primary intent
     primary = intent.get("primary", "provide_info")
-    if primary not in valid_intents:
+    if primary not in _VALID_INTENTS:
         primary = "provide_info"
 
     # Validate secondary intent
     secondary = intent.get("secondary")
-    if secondary and secondary not in valid_intents:
+    if secondary and secondary not in _VALID_INTENTS:
         secondary = None
 
     # Validate confidence
@@ -116,26 +214,17 @@ def parse_intent(data: Dict[str, Any]) -> Dict[str, Any]:
 
 def parse_emotion(emotion_str: str) -> str:
     """Parse and validate emotion string"""
-    valid_emotions = {"neutral", "positive", "anxious", "confused", "frustrated", "urgent"}
-
-    if emotion_str in valid_emotions:
+    if emotion_str in _VALID_EMOTIONS:
         return emotion_str
     return "neutral"
 
 
-def parse_extracted_fields(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-    """Parse and validate extracted fields"""
-    extracted = data.get("extracted_fields", {})
+def _parse_extracted_fields(extracted: Dict[str, Any]) -> Dict[str, ParsedField]:
+    """Validate the extracted_fields section"""
     result = {}
 
-    valid_fields = {
-        "people_count", "from_address", "to_address", "from_building_type", "to_building_type",
-        "move_date", "move_time_slot", "from_floor", "from_has_elevator",
-        "to_floor", "to_has_elevator", "packing_service", "special_notes"
-    }
-
     for field_name, field_data in extracted.items():
-        if field_name not in valid_fields:
+        if field_name not in _VALID_FIELDS:
             continue
 
         if not isinstance(field_data, dict):
@@ -151,19 +240,16 @@ def parse_extracted_fields(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     return result
 
 
-def parse_next_actions(data: Dict[str, Any]) -> list:
-    """Parse and validate next actions"""
-    actions = data.get("next_actions", [])
+def _parse_next_actions(actions: list) -> List[ParsedAction]:
+    """Validate the next_actions section"""
     result = []
 
-    valid_action_types = {"update_field", "call_tool", "collect_field", "answer_question", "handle_emotion"}
-
     for action in actions:
         if not isinstance(action, dict):
             continue
 
         action_type = action.get("type", "collect_field")
-        if action_type not in valid_action_types:
+        if action_type not in _VALID_ACTIONS:
             continue
 
         result.append({
@@ -176,19 +262,14 @@ def parse_next_actions(data: Dict[str, Any]) -> list:
     return result
 
 
-def parse_response_strategy(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse and validate response strategy"""
-    strategy = data.get("response_strategy", {})
-
-    valid_agent_types = {"collector", "advisor", "companion"}
-    valid_styles = {"friendly", "professional", "empathetic", "concise"}
-
+def _parse_response_strategy(strategy: Dict[str, Any]) -> ParsedStrategy:
+    """Validate the response_strategy section"""
     agent_type = strategy.get("agent_type", "collector")
-    if agent_type not in valid_agent_types:
+    if agent_type not in _VALID_AGENTS:
         agent_type = "collector"
 
     style = strategy.get("style", "friendly")
-    if style not in valid_styles:
+    if style not in _VALID_STYLES:
         style = "friendly"
 
     return {
@@ -200,7 +281,41 @@ def parse_response_strategy(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def parse_router_output(text: str) -> Dict[str, Any]:
+def parse_intent(data: Dict[str, Any]) -> ParsedIntent:
+    """Parse and validate intent data"""
+    return _parse_intent(data.get("intent", {}))
+
+
+def parse_extracted_fields(data: Dict[str, Any]) -> Dict[str, ParsedField]:
+    """Parse and validate extracted fields"""
+    return _parse_extracted_fields(data.get("extracted_fields", {}))
+
+
+def parse_next_actions(data: Dict[str, Any]) -> List[ParsedAction]:
+    """Parse and validate next actions"""
+    return _parse_next_actions(data.get("next_actions", []))
+
+
+def parse_response_strategy(data: Dict[str, Any]) -> ParsedStrategy:
+    """Parse and validate response strategy"""
+    return _parse_response_strategy(data.get("response_strategy", {}))
+
+
+def _router_output_from_data(data: Dict[str, Any]) -> ParsedRouterOutput:
+    """Validate every section of a decoded router payload in one pass"""
+    # 每个分区只取一次，直接交给对应的校验函数，不再经过公开包装层
+    get = data.get
+    return {
+        "intent": _parse_intent(get("intent", {})),
+        "extracted_fields": _parse_extracted_fields(get("extracted_fields", {})),
+        "user_emotion": parse_emotion(get("user_emotion", "neutral")),
+        "current_phase": int(get("current_phase", 0)),
+        "next_actions": _parse_next_actions(get("next_actions", [])),
+        "response_strategy": _parse_response_strategy(get("response_strategy", {}))
+    }
+
+
+def parse_router_output(text: str) -> ParsedRouterOutput:
     """
     Parse complete router output with full validation
 
@@ -210,13 +325,67 @@ def parse_router_output(text: str) -> Dict[str, Any]:
     Returns:
         Validated router output dict
     """
-    data = safe_parse_json(text, {})
+    return _router_output_from_data(safe_parse_json(text, {}))
 
-    return {
-        "intent": parse_intent(data),
-        "extracted_fields": parse_extracted_fields(data),
-        "user_emotion": parse_emotion(data.get("user_emotion", "neutral")),
-        "current_phase": int(data.get("current_phase", 0)),
-        "next_actions": parse_next_actions(data),
-        "response_strategy": parse_response_strategy(data)
-    }
+
+def parse_router_output_stream(chunks: Iterable[str]) -> ParsedRouterOutput:
+    """
+    Parse router output arriving as streamed text chunks
+
+    Brace depth is tracked while chunks are appended (braces inside JSON
+    strings are ignored, as in _scan_json_object), and a candidate is only
+    joined and decoded when an outermost {...} closes. Prose or a code fence
+    before the object therefore costs no extra decodes. Stops consuming
+    chunks at the first complete JSON object.
+
+    Args:
+        chunks: Streamed pieces of the raw LLM output
+
+    Returns:
+        Validated router output dict
+    """
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    start = None  # (chunk index, offset) of the outermost "{"
+    for chunk in chunks:
+        parts.append(chunk)
+        index = len(parts) - 1
+        for offset, char in enumerate(chunk):
+            if depth == 0:
+                # Outside an object only "{" matters; prose quotes are not strings
+                if char == "{":
+                    start = (index, offset)
+                    depth = 1
+                continue
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    first, first_offset = start
+                    if first == index:
+                        candidate = chunk[first_offset:offset + 1]
+                    else:
+                        candidate = "".join(
+                            [parts[first][first_offset:], *parts[first + 1:index], chunk[:offset + 1]]
+                        )
+                    try:
+                        data = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(data, dict):
+                        return _router_output_from_data(data)
+
+    # Stream ended without a complete JSON object
+    return parse_router_output("".join(parts))
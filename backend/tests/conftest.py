@@ -1,83 +1,81 @@
 """Pytest configuration and fixtures"""
 
-import pytest
-import asyncio
-from typing import Dict, Any
-
-from app.models.fields import FieldStatus, get_default_fields
+from __future__ import annotations
 
+import copy
+import json
+import types
+from contextlib import asynccontextmanager
 
-@pytest.fixture
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+import pytest
 
+from app.agents.advisor import AdvisorAgent
+from app.agents.collector import CollectorAgent, get_collector_agent
+import app.agents.router as router_module
+from app.agents.router import RouterAgent, get_router_agent
+from app.models.fields import FieldStatus, get_default_fields
+from app.models.schemas import (
+    RouterOutput, Intent, IntentType, Emotion,
+    ResponseStrategy, AgentType, ResponseStyle
+)
 
-@pytest.fixture
-def empty_fields_status() -> Dict[str, Any]:
-    """Empty fields status fixture"""
-    return get_default_fields()
 
+# Templates are built once per run; fixtures hand out deep copies because
+# tests (and the agents under test) mutate nested field dicts in place.
+_EMPTY_FIELDS_TEMPLATE = get_default_fields()
+# *_RO 包的是独立副本，误写不会波及可变 fixture 复制的模板；只读仅限顶层
+_EMPTY_FIELDS_RO = types.MappingProxyType(copy.deepcopy(_EMPTY_FIELDS_TEMPLATE))
 
-@pytest.fixture
-def partial_fields_status() -> Dict[str, Any]:
-    """Partially filled fields status"""
-    fields = get_default_fields()
-    fields["people_count"] = 2
-    fields["people_count_status"] = FieldStatus.IDEAL.value
-    fields["from_address"] = {
+_PARTIAL_FIELDS_TEMPLATE = {
+    **get_default_fields(),
+    "people_count": 2,
+    "people_count_status": FieldStatus.IDEAL.value,
+    "from_address": {
         "value": "東京都渋谷区",
         "status": FieldStatus.BASELINE.value,
         "building_type": "マンション"
-    }
-    return fields
+    },
+}
 
+_COMPLETE_FIELDS_TEMPLATE = {
+    "people_count": 2,
+    "people_count_status": FieldStatus.IDEAL.value,
+    "from_address": {
+        "value": "〒150-0001 東京都渋谷区神宮前1-2-3",
+        "postal_code": "150-0001",
+        "status": FieldStatus.IDEAL.value,
+        "building_type": "マンション"
+    },
+    "to_address": {
+        "value": "大阪府大阪市北区梅田1-1-1",
+        "status": FieldStatus.BASELINE.value,
+        "building_type": "戸建て"
+    },
+    "move_date": {
+        "value": "2026-03-15",
+        "time_slot": "上午",
+        "status": FieldStatus.IDEAL.value
+    },
+    "items": {
+        "list": [
+            {"name": "冷蔵庫", "size": "大"},
+            {"name": "洗濯機", "size": "中"}
+        ],
+        "status": FieldStatus.BASELINE.value
+    },
+    "from_floor_elevator": {
+        "floor": 5,
+        "has_elevator": True,
+        "status": FieldStatus.BASELINE.value
+    },
+    "packing_service": "自己打包",
+    "special_notes": ["有宜家家具"]
+}
 
-@pytest.fixture
-def complete_fields_status() -> Dict[str, Any]:
-    """Complete fields status (can submit)"""
-    return {
-        "people_count": 2,
-        "people_count_status": FieldStatus.IDEAL.value,
-        "from_address": {
-            "value": "〒150-0001 東京都渋谷区神宮前1-2-3",
-            "postal_code": "150-0001",
-            "status": FieldStatus.IDEAL.value,
-            "building_type": "マンション"
-        },
-        "to_address": {
-            "value": "大阪府大阪市北区梅田1-1-1",
-            "status": FieldStatus.BASELINE.value,
-            "building_type": "戸建て"
-        },
-        "move_date": {
-            "value": "2026-03-15",
-            "time_slot": "上午",
-            "status": FieldStatus.IDEAL.value
-        },
-        "items": {
-            "list": [
-                {"name": "冷蔵庫", "size": "大"},
-                {"name": "洗濯機", "size": "中"}
-            ],
-            "status": FieldStatus.BASELINE.value
-        },
-        "from_floor_elevator": {
-            "floor": 5,
-            "has_elevator": True,
-            "status": FieldStatus.BASELINE.value
-        },
-        "packing_service": "自己打包",
-        "special_notes": ["有宜家家具"]
-    }
+_COMPLETE_FIELDS_RO = types.MappingProxyType(copy.deepcopy(_COMPLETE_FIELDS_TEMPLATE))
 
 
-@pytest.fixture
-def sample_router_output_json() -> str:
-    """Sample router LLM output"""
-    return '''{
+_SAMPLE_ROUTER_OUTPUT_JSON = '''{
   "intent": {
     "primary": "provide_info",
     "secondary": null,
@@ -115,8 +113,150 @@ def sample_router_output_json() -> str:
   }
 }'''
 
+# 只解析一次，供需要 dict 形式的测试复用
+_SAMPLE_ROUTER_OUTPUT = json.loads(_SAMPLE_ROUTER_OUTPUT_JSON)
+_SAMPLE_ROUTER_OUTPUT_RO = types.MappingProxyType(copy.deepcopy(_SAMPLE_ROUTER_OUTPUT))
+
+
+def _make_router(**overrides) -> RouterOutput:
+    # 测试输入可信，用 model_construct 跳过 pydantic 校验
+    defaults = dict(
+        intent=Intent.model_construct(primary=IntentType.PROVIDE_INFO, confidence=0.9),
+        extracted_fields={},
+        user_emotion=Emotion.NEUTRAL,
+        current_phase=1,
+        next_actions=[],
+        response_strategy=ResponseStrategy.model_construct(
+            agent_type=AgentType.COLLECTOR,
+            style=ResponseStyle.FRIENDLY
+        ),
+        updated_fields_status={}
+    )
+    defaults.update(overrides)
+    return RouterOutput.model_construct(**defaults)
+
+
+class FakeLLMClient:
+    """Hand-rolled LLM client double: records calls, returns a canned reply
+
+    Replies queued in `responses` are returned first, in order; after that
+    every call gets `next_response`.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.responses = []
+        self.next_response = {"content": "", "error": None}
+
+    async def chat_complete(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.responses:
+            return self.responses.pop(0)
+        return self.next_response
+
+    def reset(self):
+        self.calls.clear()
+        self.responses.clear()
+        self.next_response = {"content": "", "error": None}
+
 
 @pytest.fixture
+def fake_llm_client() -> FakeLLMClient:
+    """Fresh fake LLM client per test"""
+    return FakeLLMClient()
+
+
+@pytest.fixture(scope="module")
+def module_fake_llm_client() -> FakeLLMClient:
+    """Fake LLM client shared by a module; reset it between tests"""
+    return FakeLLMClient()
+
+
+@pytest.fixture(scope="session")
+def make_router():
+    """Factory for unvalidated RouterOutput fakes"""
+    return _make_router
+
+
+@pytest.fixture(scope="module")
+def advisor() -> AdvisorAgent:
+    """AdvisorAgent without LLM client, shared per module"""
+    agent = object.__new__(AdvisorAgent)
+    agent.llm_client = None
+    return agent
+
+
+@pytest.fixture(scope="module")
+def collector() -> CollectorAgent:
+    """Collector singleton, reused read-only across tests"""
+    return get_collector_agent()
+
+
+@pytest.fixture(scope="session")
+def router_agent() -> RouterAgent:
+    """The get_router_agent() singleton, primed once for the run; tests only swap its llm_client"""
+    router_module._router_agent = None
+    yield get_router_agent()
+    router_module._router_agent = None
+
+
+@pytest.fixture(scope="module")
+def bare_router() -> RouterAgent:
+    """RouterAgent without LLM client, for tests of its pure helpers"""
+    agent = object.__new__(RouterAgent)
+    agent.llm_client = None
+    return agent
+
+
+@pytest.fixture
+def empty_fields_status() -> dict:
+    """Empty fields status fixture"""
+    return copy.deepcopy(_EMPTY_FIELDS_TEMPLATE)
+
+
+@pytest.fixture(scope="session")
+def empty_fields_status_ro() -> types.MappingProxyType:
+    """Shared read-only empty fields status for pure helpers; top-level writes raise TypeError"""
+    return _EMPTY_FIELDS_RO
+
+
+@pytest.fixture
+def partial_fields_status() -> dict:
+    """Partially filled fields status"""
+    return copy.deepcopy(_PARTIAL_FIELDS_TEMPLATE)
+
+
+@pytest.fixture
+def complete_fields_status() -> dict:
+    """Complete fields status (can submit)"""
+    return copy.deepcopy(_COMPLETE_FIELDS_TEMPLATE)
+
+
+@pytest.fixture(scope="session")
+def complete_fields_status_ro() -> types.MappingProxyType:
+    """Shared read-only complete fields status; top-level writes raise TypeError"""
+    return _COMPLETE_FIELDS_RO
+
+
+@pytest.fixture(scope="session")
+def sample_router_output_json() -> str:
+    """Sample router LLM output"""
+    return _SAMPLE_ROUTER_OUTPUT_JSON
+
+
+@pytest.fixture
+def sample_router_output_dict() -> dict:
+    """Parsed sample router output (mutable copy)"""
+    return copy.deepcopy(_SAMPLE_ROUTER_OUTPUT)
+
+
+@pytest.fixture(scope="session")
+def sample_router_output_dict_ro() -> types.MappingProxyType:
+    """Shared read-only parsed sample router output; top-level writes raise TypeError"""
+    return _SAMPLE_ROUTER_OUTPUT_RO
+
+
+@pytest.fixture(scope="session")
 def sample_messages() -> list:
     """Sample conversation history"""
     return [
@@ -124,3 +264,58 @@ def sample_messages() -> list:
         {"role": "user", "content": "我想搬家"},
         {"role": "assistant", "content": "好的，请问是几个人搬家呢？"}
     ]
+
+
+class _FakeResult:
+    """Result of FakeAsyncSession.execute"""
+
+    __slots__ = ("_scalar", "rowcount")
+
+    def __init__(self, scalar, rowcount: int):
+        self._scalar = scalar
+        self.rowcount = rowcount
+
+    def scalar_one_or_none(self):
+        return self._scalar
+
+
+class FakeAsyncSession:
+    """Plain-class stand-in for an AsyncSession; every execute returns the same result"""
+
+    def __init__(self, scalar_result=None, rowcount: int = 1):
+        self._result = _FakeResult(scalar_result, rowcount)
+        self.executed = []
+        self.added = []
+        self.flush_count = 0
+
+    async def execute(self, stmt):
+        self.executed.append(stmt)
+        return self._result
+
+    def add(self, obj) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        self.flush_count += 1
+
+
+@pytest.fixture
+def mock_db_session(monkeypatch):
+    """Factory that patches quote_service.get_db_context with a FakeAsyncSession
+
+    Usage: ``session = mock_db_session(scalar_result=None, rowcount=1)``.
+    The patch is undone by monkeypatch at teardown.
+    """
+    def make(scalar_result=None, rowcount: int = 1) -> FakeAsyncSession:
+        session = FakeAsyncSession(scalar_result, rowcount)
+
+        @asynccontextmanager
+        async def fake_db_context():
+            yield session
+
+        monkeypatch.setattr(
+            "app.services.quote_service.get_db_context", fake_db_context
+        )
+        return session
+
+    return make
@@ -1,9 +1,8 @@
 """Tests for Advisor Agent"""
 
 import pytest
-from unittest.mock import AsyncMock, patch
 
-from app.agents.advisor import AdvisorAgent, AdvisorResponse
+from app.agents.advisor import AdvisorResponse
 from app.agents.prompts.advisor_prompt import (
     build_advisor_prompt,
     get_quick_answer,
@@ -12,7 +11,7 @@ from app.agents.prompts.advisor_prompt import (
     QUESTION_KNOWLEDGE_MAP
 )
 from app.models.schemas import (
-    RouterOutput, Intent, IntentType, Emotion,
+    Intent, IntentType,
     Action, ActionType, ResponseStrategy, AgentType, ResponseStyle
 )
 
@@ -20,54 +19,32 @@ from app.models.schemas import (
 class TestAdvisorKnowledgeBase:
     """Tests for advisor knowledge base"""
 
-    def test_knowledge_has_price_info(self):
-        """Test price knowledge exists"""
-        assert "price" in MOVING_KNOWLEDGE
-        assert "factors" in MOVING_KNOWLEDGE["price"]
-        assert "estimates" in MOVING_KNOWLEDGE["price"]
-        assert "tips" in MOVING_KNOWLEDGE["price"]
-
-    def test_knowledge_has_process_info(self):
-        """Test process knowledge exists"""
-        assert "process" in MOVING_KNOWLEDGE
-        assert "timeline" in MOVING_KNOWLEDGE["process"]
-        assert "checklist" in MOVING_KNOWLEDGE["process"]
-
-    def test_knowledge_has_company_info(self):
-        """Test company knowledge exists"""
-        assert "company" in MOVING_KNOWLEDGE
-        assert "major_companies" in MOVING_KNOWLEDGE["company"]
-        assert "selection_tips" in MOVING_KNOWLEDGE["company"]
-
-    def test_knowledge_has_tips(self):
-        """Test tips knowledge exists"""
-        assert "tips" in MOVING_KNOWLEDGE
-        assert "packing" in MOVING_KNOWLEDGE["tips"]
-        assert "cost_saving" in MOVING_KNOWLEDGE["tips"]
+    @pytest.mark.parametrize("key,subkeys", [
+        ("price", ["factors", "estimates", "tips"]),
+        ("process", ["timeline", "checklist"]),
+        ("company", ["major_companies", "selection_tips"]),
+        ("tips", ["packing", "cost_saving"]),
+    ])
+    def test_knowledge_structure(self, key, subkeys):
+        """Test each knowledge area exists with its sections"""
+        assert key in MOVING_KNOWLEDGE
+        for subkey in subkeys:
+            assert subkey in MOVING_KNOWLEDGE[key]
 
 
 class TestGetRelevantKnowledge:
     """Tests for get_relevant_knowledge function"""
 
-    def test_price_question(self):
-        """Test price question returns price knowledge"""
-        knowledge = get_relevant_knowledge("ask_price")
-        assert "price" in knowledge or "factors" in knowledge
-
-    def test_process_question(self):
-        """Test process question returns process knowledge"""
-        knowledge = get_relevant_knowledge("ask_process")
-        assert "process" in knowledge or "timeline" in knowledge
-
-    def test_company_question(self):
-        """Test company question returns company knowledge"""
-        knowledge = get_relevant_knowledge("ask_company")
-        assert "company" in knowledge
-
-    def test_tips_question(self):
-        """Test tips question returns tips knowledge"""
-        knowledge = get_relevant_knowledge("ask_tips")
-        assert "tips" in knowledge
+    @pytest.mark.parametrize("question_type,markers", [
+        ("ask_price", ["price", "factors"]),
+        ("ask_process", ["process", "timeline"]),
+        ("ask_company", ["company"]),
+        ("ask_tips", ["tips"]),
+    ])
+    def test_question_returns_matching_knowledge(self, question_type, markers):
+        """Test each question type returns its knowledge area"""
+        knowledge = get_relevant_knowledge(question_type)
+        assert any(marker in knowledge for marker in markers)
 
     def test_general_question(self):
         """Test general question returns mixed knowledge"""
@@ -78,11 +55,11 @@ class TestGetRelevantKnowledge:
 class TestBuildAdvisorPrompt:
     """Tests for build_advisor_prompt function"""
 
-    def test_basic_prompt_structure(self, empty_fields_status):
+    def test_basic_prompt_structure(self, empty_fields_status_ro):
         """Test basic prompt structure"""
         prompt = build_advisor_prompt(
             question_type="ask_price",
-            fields_status=empty_fields_status,
+            fields_status=empty_fields_status_ro,
             recent_messages=[],
             style="friendly",
             user_emotion="neutral"
@@ -91,26 +68,26 @@ class TestBuildAdvisorPrompt:
         assert "ERABU" in prompt or "搬家顾问" in prompt or "Advisor" in prompt
         assert "ask_price" in prompt
 
-    def test_prompt_includes_knowledge(self, empty_fields_status):
+    def test_prompt_includes_knowledge(self, empty_fields_status_ro):
         """Test prompt includes relevant knowledge"""
         prompt = build_advisor_prompt(
             question_type="ask_price",
-            fields_status=empty_fields_status
+            fields_status=empty_fields_status_ro
         )
 
         # Should include some price-related content
         assert "price" in prompt.lower() or "费用" in prompt or "价格" in prompt
 
-    def test_prompt_respects_style(self, empty_fields_status):
+    def test_prompt_respects_style(self, empty_fields_status_ro):
         """Test prompt respects style parameter"""
         friendly_prompt = build_advisor_prompt(
             question_type="ask_general",
-            fields_status=empty_fields_status,
+            fields_status=empty_fields_status_ro,
             style="friendly"
         )
         professional_prompt = build_advisor_prompt(
             question_type="ask_general",
-            fields_status=empty_fields_status,
+            fields_status=empty_fields_status_ro,
             style="professional"
         )
 
@@ -121,17 +98,16 @@ class TestBuildAdvisorPrompt:
 class TestGetQuickAnswer:
     """Tests for get_quick_answer function"""
 
+    @pytest.mark.parametrize("key", ["price_range", "best_time"])
+    def test_known_key_answer(self, key):
+        """Test known keys return an answer"""
+        assert get_quick_answer(key) is not None
+
     def test_price_range_answer(self):
-        """Test price range quick answer"""
+        """Test price range quick answer content"""
         answer = get_quick_answer("price_range")
-        assert answer is not None
         assert "万日元" in answer or "搬家" in answer
 
-    def test_best_time_answer(self):
-        """Test best time quick answer"""
-        answer = get_quick_answer("best_time")
-        assert answer is not None
-
     def test_unknown_key_returns_none(self):
         """Test unknown key returns None"""
         answer = get_quick_answer("nonexistent_key")
@@ -141,44 +117,27 @@ class TestGetQuickAnswer:
 class TestAdvisorAgentDetermineQuestionType:
     """Tests for AdvisorAgent._determine_question_type"""
 
-    @pytest.fixture
-    def advisor(self):
-        # Create without llm_client initialization
-        agent = object.__new__(AdvisorAgent)
-        agent.llm_client = None
-        return agent
-
-    def test_ask_price_intent(self, advisor):
+    def test_ask_price_intent(self, advisor, make_router):
         """Test ask_price intent mapping"""
-        router_output = RouterOutput(
-            intent=Intent(primary=IntentType.ASK_PRICE, confidence=0.9),
-            extracted_fields={},
-            user_emotion=Emotion.NEUTRAL,
-            current_phase=1,
-            next_actions=[],
-            response_strategy=ResponseStrategy(
+        router_output = make_router(
+            intent=Intent.model_construct(primary=IntentType.ASK_PRICE, confidence=0.9),
+            response_strategy=ResponseStrategy.model_construct(
                 agent_type=AgentType.ADVISOR,
                 style=ResponseStyle.FRIENDLY
-            ),
-            updated_fields_status={}
+            )
         )
 
         result = advisor._determine_question_type(router_output)
         assert result == "ask_price"
 
-    def test_ask_process_intent(self, advisor):
+    def test_ask_process_intent(self, advisor, make_router):
         """Test ask_process intent mapping"""
-        router_output = RouterOutput(
-            intent=Intent(primary=IntentType.ASK_PROCESS, confidence=0.9),
-            extracted_fields={},
-            user_emotion=Emotion.NEUTRAL,
-            current_phase=1,
-            next_actions=[],
-            response_strategy=ResponseStrategy(
+        router_output = make_router(
+            intent=Intent.model_construct(primary=IntentType.ASK_PROCESS, confidence=0.9),
+            response_strategy=ResponseStrategy.model_construct(
                 agent_type=AgentType.ADVISOR,
                 style=ResponseStyle.FRIENDLY
-            ),
-            updated_fields_status={}
+            )
         )
 
         result = advisor._determine_question_type(router_output)
@@ -188,16 +147,15 @@ class TestAdvisorAgentDetermineQuestionType:
 class TestAdvisorAgentGetKnowledgeAreas:
     """Tests for AdvisorAgent._get_knowledge_areas"""
 
-    @pytest.fixture
-    def advisor(self):
-        agent = object.__new__(AdvisorAgent)
-        agent.llm_client = None
-        return agent
-
-    def test_price_knowledge_areas(self, advisor):
-        """Test price returns price knowledge area"""
-        areas = advisor._get_knowledge_areas("ask_price")
-        assert "price" in areas
+    @pytest.mark.parametrize("question_type,expected", [
+        ("ask_price", "price"),
+        ("ask_process", "process"),
+        ("ask_company", "company"),
+        ("ask_tips", "tips"),
+    ])
+    def test_knowledge_areas(self, advisor, question_type, expected):
+        """Test each question type maps to its knowledge area"""
+        assert expected in advisor._get_knowledge_areas(question_type)
 
     def test_general_knowledge_areas(self, advisor):
         """Test general returns multiple areas"""
@@ -208,12 +166,6 @@ class TestAdvisorAgentGetKnowledgeAreas:
 class TestAdvisorAgentGetFallbackResponse:
     """Tests for AdvisorAgent._get_fallback_response"""
 
-    @pytest.fixture
-    def advisor(self):
-        agent = object.__new__(AdvisorAgent)
-        agent.llm_client = None
-        return agent
-
     def test_price_fallback(self, advisor):
         """Test price fallback response"""
         response = advisor._get_fallback_response("ask_price")
@@ -234,23 +186,17 @@ class TestAdvisorAgentGetFallbackResponse:
 class TestAdvisorAgentGetQuickOptions:
     """Tests for AdvisorAgent._get_quick_options"""
 
-    @pytest.fixture
-    def advisor(self):
-        agent = object.__new__(AdvisorAgent)
-        agent.llm_client = None
-        return agent
-
-    def test_price_options(self, advisor, empty_fields_status):
+    def test_price_options(self, advisor, empty_fields_status_ro):
         """Test price question options"""
-        options = advisor._get_quick_options("ask_price", empty_fields_status)
+        options = advisor._get_quick_options("ask_price", empty_fields_status_ro)
         assert len(options) > 0
 
-    def test_process_options(self, advisor, empty_fields_status):
+    def test_process_options(self, advisor, empty_fields_status_ro):
         """Test process question options"""
-        options = advisor._get_quick_options("ask_process", empty_fields_status)
+        options = advisor._get_quick_options("ask_process", empty_fields_status_ro)
         assert len(options) > 0
 
-    def test_complete_fields_options(self, advisor, complete_fields_status):
+    def test_complete_fields_options(self, advisor, complete_fields_status_ro):
         """Test options when fields are complete"""
-        options = advisor._get_quick_options("ask_general", complete_fields_status)
+        options = advisor._get_quick_options("ask_general", complete_fields_status_ro)
         assert any("确认" in opt for opt in options)
@@ -1,51 +1,55 @@
 """Tests for Collector Agent"""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.agents.collector import CollectorAgent, CollectorResponse, get_collector_agent
 from app.models.schemas import (
-    RouterOutput, Intent, IntentType, ExtractedField,
-    Emotion, Action, ActionType, ResponseStrategy,
+    ExtractedField, Action, ActionType, ResponseStrategy,
     AgentType, ResponseStyle
 )
 from app.models.fields import FieldStatus
+from app.services.field_validator import ValidationResult
+
+
+@pytest.fixture(scope="module", autouse=True)
+def llm_stub(collector, module_fake_llm_client):
+    """Route the collector's chat_complete through one module-wide FakeLLMClient"""
+    llm_client = collector.llm_client
+    original = llm_client.chat_complete
+    llm_client.chat_complete = module_fake_llm_client.chat_complete
+    try:
+        yield module_fake_llm_client
+    finally:
+        llm_client.chat_complete = original
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_stub(llm_stub):
+    yield
+    llm_stub.reset()
 
 
 class TestCollectorAgentDetermineTargetField:
     """Tests for _determine_target_field"""
 
     @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    @pytest.fixture
-    def basic_router_output(self):
+    def basic_router_output(self, make_router):
         """Create basic router output"""
-        return RouterOutput(
-            intent=Intent(
-                primary=IntentType.PROVIDE_INFO,
-                secondary=None,
-                confidence=0.9
-            ),
-            extracted_fields={},
-            user_emotion=Emotion.NEUTRAL,
-            current_phase=1,
+        return make_router(
             next_actions=[
-                Action(
+                Action.model_construct(
                     type=ActionType.COLLECT_FIELD,
                     target="people_count",
                     priority=1
                 )
             ],
-            response_strategy=ResponseStrategy(
+            response_strategy=ResponseStrategy.model_construct(
                 agent_type=AgentType.COLLECTOR,
                 style=ResponseStyle.FRIENDLY,
                 should_acknowledge=True,
                 guide_to_field="people_count",
                 include_options=True
-            ),
-            updated_fields_status={}
+            )
         )
 
     def test_uses_guide_to_field(self, collector, basic_router_output, empty_fields_status):
@@ -53,39 +57,28 @@ class TestCollectorAgentDetermineTargetField:
         result = collector._determine_target_field(basic_router_output, empty_fields_status)
         assert result == "people_count"
 
-    def test_uses_next_actions(self, collector, empty_fields_status):
+    def test_uses_next_actions(self, collector, make_router, empty_fields_status):
         """Test falls back to next_actions"""
-        router_output = RouterOutput(
-            intent=Intent(primary=IntentType.PROVIDE_INFO, confidence=0.9),
-            extracted_fields={},
-            user_emotion=Emotion.NEUTRAL,
+        router_output = make_router(
             current_phase=2,
             next_actions=[
-                Action(type=ActionType.COLLECT_FIELD, target="from_address", priority=1)
+                Action.model_construct(type=ActionType.COLLECT_FIELD, target="from_address", priority=1)
             ],
-            response_strategy=ResponseStrategy(
+            response_strategy=ResponseStrategy.model_construct(
                 agent_type=AgentType.COLLECTOR,
                 style=ResponseStyle.FRIENDLY,
                 guide_to_field=None  # No guide_to_field
-            ),
-            updated_fields_status={}
+            )
         )
-        collector_agent = CollectorAgent()
-        result = collector_agent._determine_target_field(router_output, empty_fields_status)
+        result = collector._determine_target_field(router_output, empty_fields_status)
         assert result == "from_address"
 
 
 class TestCollectorAgentUpdateField:
     """Tests for _update_field"""
 
-    @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
     def test_update_people_count(self, collector, empty_fields_status):
         """Test updating people_count"""
-        from app.services.field_validator import ValidationResult
-
         result = ValidationResult(
             is_valid=True,
             parsed_value=3,
@@ -98,8 +91,6 @@ class TestCollectorAgentUpdateField:
 
     def test_update_from_address(self, collector, empty_fields_status):
         """Test updating from_address"""
-        from app.services.field_validator import ValidationResult
-
         result = ValidationResult(
             is_valid=True,
             parsed_value={
@@ -117,8 +108,6 @@ class TestCollectorAgentUpdateField:
 
     def test_update_special_notes_appends(self, collector):
         """Test special_notes appends to existing list"""
-        from app.services.field_validator import ValidationResult
-
         fields = {"special_notes": ["有钢琴"]}
         result = ValidationResult(
             is_valid=True,
@@ -132,8 +121,6 @@ class TestCollectorAgentUpdateField:
 
     def test_update_removes_duplicate_notes(self, collector):
         """Test special_notes removes duplicates"""
-        from app.services.field_validator import ValidationResult
-
         fields = {"special_notes": ["有钢琴"]}
         result = ValidationResult(
             is_valid=True,
@@ -148,80 +135,34 @@ class TestCollectorAgentUpdateField:
 class TestCollectorAgentDetermineSubTask:
     """Tests for _determine_sub_task"""
 
-    @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    def test_needs_postal_for_from_address(self, collector):
-        """Test sub_task for from_address missing postal"""
-        fields = {
-            "from_address": {
-                "value": "東京都渋谷区",
-                "status": "in_progress"
-            }
-        }
-        sub_task = collector._determine_sub_task("from_address", fields, {})
-        assert sub_task == "ask_postal"
-
-    def test_needs_building_type(self, collector):
-        """Test sub_task for missing building type"""
-        fields = {
-            "from_address": {
-                "value": "東京都渋谷区",
-                "postal_code": "150-0001",
-                "status": "baseline"
-            }
-        }
-        sub_task = collector._determine_sub_task("from_address", fields, {})
-        assert sub_task == "ask_building_type"
-
-    def test_needs_time_slot(self, collector):
-        """Test sub_task for missing time slot"""
-        fields = {
-            "move_date": {
-                "value": "2026-03-15",
-                "status": "baseline"
-            }
-        }
-        sub_task = collector._determine_sub_task("move_date", fields, {})
-        assert sub_task == "ask_time_slot"
-
-    def test_needs_elevator(self, collector):
-        """Test sub_task for missing elevator info"""
-        fields = {
-            "from_floor_elevator": {
-                "floor": 5,
-                "has_elevator": None
-            }
-        }
-        sub_task = collector._determine_sub_task("from_floor_elevator", fields, {})
-        assert sub_task == "ask_elevator"
+    @pytest.mark.parametrize("field,data,expected", [
+        ("from_address", {"value": "東京都渋谷区", "status": "in_progress"}, "ask_postal"),
+        (
+            "from_address",
+            {"value": "東京都渋谷区", "postal_code": "150-0001", "status": "baseline"},
+            "ask_building_type"
+        ),
+        ("move_date", {"value": "2026-03-15", "status": "baseline"}, "ask_time_slot"),
+        ("from_floor_elevator", {"floor": 5, "has_elevator": None}, "ask_elevator"),
+    ])
+    def test_determine_sub_task(self, collector, field, data, expected):
+        """Test sub_task for each partially filled field"""
+        assert collector._determine_sub_task(field, {field: data}, {}) == expected
 
 
 class TestCollectorAgentGetQuickOptions:
     """Tests for _get_quick_options"""
 
-    @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    def test_people_count_options(self, collector, empty_fields_status):
-        """Test quick options for people_count"""
-        options = collector._get_quick_options("people_count", None, empty_fields_status)
-        assert "单身" in options
-        assert "2~3人" in options
-
-    def test_building_type_options(self, collector, empty_fields_status):
-        """Test quick options for building type sub-task"""
-        options = collector._get_quick_options("from_address", "ask_building_type", empty_fields_status)
-        assert "マンション" in options
-        assert "戸建て" in options
-
-    def test_time_slot_options(self, collector, empty_fields_status):
-        """Test quick options for time slot sub-task"""
-        options = collector._get_quick_options("move_date", "ask_time_slot", empty_fields_status)
-        assert "上午" in options
-        assert "下午" in options
+    @pytest.mark.parametrize("field,sub_task,expected", [
+        ("people_count", None, ["单身", "2~3人"]),
+        ("from_address", "ask_building_type", ["マンション", "戸建て"]),
+        ("move_date", "ask_time_slot", ["上午", "下午"]),
+    ])
+    def test_field_options(self, collector, empty_fields_status_ro, field, sub_task, expected):
+        """Test quick options for each field / sub-task"""
+        options = collector._get_quick_options(field, sub_task, empty_fields_status_ro)
+        for option in expected:
+            assert option in options
 
     def test_special_notes_filters_selected(self, collector):
         """Test special notes filters already selected options"""
@@ -234,71 +175,43 @@ class TestCollectorAgentGetQuickOptions:
 class TestCollectorAgentCheckCompletion:
     """Tests for _check_completion"""
 
-    @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    def test_incomplete_returns_false(self, collector, empty_fields_status):
+    def test_incomplete_returns_false(self, collector, empty_fields_status_ro):
         """Test incomplete fields returns False"""
-        result = collector._check_completion(empty_fields_status)
+        result = collector._check_completion(empty_fields_status_ro)
         assert result is False
 
-    def test_complete_returns_true(self, collector, complete_fields_status):
+    def test_complete_returns_true(self, collector, complete_fields_status_ro):
         """Test complete fields returns True"""
-        result = collector._check_completion(complete_fields_status)
+        result = collector._check_completion(complete_fields_status_ro)
         assert result is True
 
 
 class TestCollectorAgentValidateField:
     """Tests for _validate_field"""
 
-    @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    @pytest.mark.asyncio
-    async def test_validate_people_count(self, collector, empty_fields_status):
-        """Test people_count validation"""
-        result = await collector._validate_field("people_count", 3, empty_fields_status)
-        assert result.is_valid
-        assert result.parsed_value == 3
-
-    @pytest.mark.asyncio
-    async def test_validate_from_address(self, collector, empty_fields_status):
-        """Test from_address validation"""
-        result = await collector._validate_field(
-            "from_address",
-            "〒150-0001 東京都渋谷区",
-            empty_fields_status
-        )
-        assert result.is_valid
-
     @pytest.mark.asyncio
-    async def test_validate_building_type(self, collector, empty_fields_status):
-        """Test building type validation"""
-        result = await collector._validate_field(
-            "from_building_type",
-            "マンション",
-            empty_fields_status
-        )
+    @pytest.mark.parametrize("field,value,expected", [
+        ("people_count", 3, 3),
+        ("from_address", "〒150-0001 東京都渋谷区", None),
+        ("from_building_type", "マンション", "マンション"),
+    ])
+    async def test_validate_field(self, collector, empty_fields_status, field, value, expected):
+        """Test validation through the real field validator"""
+        result = await collector._validate_field(field, value, empty_fields_status)
         assert result.is_valid
-        assert result.parsed_value == "マンション"
+        if expected is not None:
+            assert result.parsed_value == expected
 
 
 class TestCollectorAgentCollect:
     """Tests for collect method"""
 
     @pytest.fixture
-    def collector(self):
-        return CollectorAgent()
-
-    @pytest.fixture
-    def router_output_with_extraction(self):
+    def router_output_with_extraction(self, make_router):
         """Router output with extracted fields"""
-        return RouterOutput(
-            intent=Intent(primary=IntentType.PROVIDE_INFO, confidence=0.9),
+        return make_router(
             extracted_fields={
-                "people_count": ExtractedField(
+                "people_count": ExtractedField.model_construct(
                     field_name="people_count",
                     raw_value="3人",
                     parsed_value=3,
@@ -306,46 +219,37 @@ class TestCollectorAgentCollect:
                     confidence=0.95
                 )
             },
-            user_emotion=Emotion.NEUTRAL,
-            current_phase=1,
             next_actions=[
-                Action(type=ActionType.COLLECT_FIELD, target="from_address", priority=1)
+                Action.model_construct(type=ActionType.COLLECT_FIELD, target="from_address", priority=1)
             ],
-            response_strategy=ResponseStrategy(
+            response_strategy=ResponseStrategy.model_construct(
                 agent_type=AgentType.COLLECTOR,
                 style=ResponseStyle.FRIENDLY,
                 should_acknowledge=True,
                 guide_to_field="from_address"
-            ),
-            updated_fields_status={}
+            )
         )
 
     @pytest.mark.asyncio
     async def test_collect_updates_fields(
         self,
         collector,
+        llm_stub,
         router_output_with_extraction,
         empty_fields_status
     ):
         """Test collect updates fields correctly"""
-        # Mock LLM client
-        mock_response = {"content": "好的，3人搬家。请问您现在住在哪里呢？", "error": None}
-
-        with patch.object(
-            collector.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await collector.collect(
-                router_output=router_output_with_extraction,
-                user_message="3个人搬家",
-                fields_status=empty_fields_status
-            )
+        llm_stub.next_response = {"content": "好的，3人搬家。请问您现在住在哪里呢？", "error": None}
+
+        result = await collector.collect(
+            router_output=router_output_with_extraction,
+            user_message="3个人搬家",
+            fields_status=empty_fields_status
+        )
 
-            assert isinstance(result, CollectorResponse)
-            assert result.updated_fields["people_count"] == 3
-            assert result.next_field == "from_address"
+        assert isinstance(result, CollectorResponse)
+        assert result.updated_fields["people_count"] == 3
+        assert result.next_field == "from_address"
 
 
 class TestGetCollectorAgent:
@@ -4,13 +4,15 @@ import pytest
 from app.services.field_validator import FieldValidator, ValidationResult, get_field_validator
 
 
+@pytest.fixture(scope="module")
+def validator():
+    """FieldValidator singleton shared by the whole module"""
+    return get_field_validator()
+
+
 class TestFieldValidatorPeopleCount:
     """Tests for people_count validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_valid_integer(self, validator):
         """Test valid integer people count"""
         result = validator.validate_people_count(3)
@@ -46,6 +48,18 @@ class TestFieldValidatorPeopleCount:
         assert result.parsed_value == 4
         assert result.status == "baseline"
 
+    @pytest.mark.parametrize("value", [-1000, *range(-3, 13), 99, 1000])
+    def test_integer_validity_tracks_sign(self, validator, value):
+        """Property: an integer count is valid exactly when it is positive"""
+        result = validator.validate_people_count(value)
+        assert result.is_valid == (value > 0)
+        if result.is_valid:
+            assert result.parsed_value == value
+            assert result.status == "ideal"
+        else:
+            assert result.parsed_value is None
+            assert result.status == "invalid"
+
     def test_zero_invalid(self, validator):
         """Test zero is invalid"""
         result = validator.validate_people_count(0)
@@ -72,10 +86,6 @@ class TestFieldValidatorPeopleCount:
 class TestFieldValidatorAddress:
     """Tests for address validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_from_address_with_postal_code(self, validator):
         """Test from_address with postal code is baseline"""
         result = validator.validate_address(
@@ -105,6 +115,19 @@ class TestFieldValidatorAddress:
         assert result.status == "baseline"
         assert result.parsed_value["prefecture"] is not None
 
+    @pytest.mark.parametrize("address_type,value,expected_status", [
+        ("from", {"value": "東京都渋谷区神宮前1-2-3", "postal_code": "150-0001"}, "baseline"),
+        ("to", {"value": "大阪府大阪市", "prefecture": "大阪府", "city": "大阪市"}, "baseline"),
+        ("to", {"value": "大阪市北区", "city": "大阪市", "district": "北区"}, "ideal"),
+    ])
+    def test_router_extracted_components(self, validator, address_type, value, expected_status):
+        """Test components extracted by the Router are used without re-parsing"""
+        result = validator.validate_address(value, address_type)
+        assert result.is_valid
+        assert result.status == expected_status
+        for key, component in value.items():
+            assert result.parsed_value[key] == component
+
     def test_empty_address_invalid(self, validator):
         """Test empty address is invalid"""
         result = validator.validate_address("", "from")
@@ -119,26 +142,13 @@ class TestFieldValidatorAddress:
 class TestFieldValidatorBuildingType:
     """Tests for building type validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
-    def test_valid_mansion(self, validator):
-        """Test マンション is valid"""
-        result = validator.validate_building_type("マンション")
+    @pytest.mark.parametrize("value", ["マンション", "アパート", "戸建て"])
+    def test_valid_building_type(self, validator, value):
+        """Test known building types are valid"""
+        result = validator.validate_building_type(value)
         assert result.is_valid
         assert result.status == "ideal"
 
-    def test_valid_apartment(self, validator):
-        """Test アパート is valid"""
-        result = validator.validate_building_type("アパート")
-        assert result.is_valid
-
-    def test_valid_house(self, validator):
-        """Test 戸建て is valid"""
-        result = validator.validate_building_type("戸建て")
-        assert result.is_valid
-
     def test_normalize_house_variant(self, validator):
         """Test 一戸建て is normalized to 戸建て"""
         result = validator.validate_building_type("一戸建て")
@@ -154,10 +164,6 @@ class TestFieldValidatorBuildingType:
 class TestFieldValidatorMoveDate:
     """Tests for move date validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_iso_date(self, validator):
         """Test ISO format date"""
         result = validator.validate_move_date("2026-03-15")
@@ -188,6 +194,20 @@ class TestFieldValidatorMoveDate:
         assert result.is_valid
         assert result.status == "needs_verification"
 
+    @pytest.mark.parametrize("value,expected_status", [
+        ({"value": "2026年3月15日", "year": 2026, "month": 3, "day": 15}, "baseline"),
+        ({"value": "3月上旬", "month": 3, "period": "上旬"}, "baseline"),
+        ({"value": "3月", "month": 3}, "needs_verification"),
+        ({"value": "春天"}, "needs_verification"),
+        ({}, "invalid"),
+    ])
+    def test_router_extracted_date(self, validator, value, expected_status):
+        """Test date components extracted by the Router decide the status"""
+        result = validator.validate_move_date(value)
+        assert result.status == expected_status
+        if value.get("month"):
+            assert result.parsed_value["year"] is not None
+
     def test_none_invalid(self, validator):
         """Test None is invalid"""
         result = validator.validate_move_date(None)
@@ -197,42 +217,24 @@ class TestFieldValidatorMoveDate:
 class TestFieldValidatorTimeSlot:
     """Tests for time slot validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
-    def test_morning(self, validator):
-        """Test morning time slot"""
-        result = validator.validate_time_slot("上午")
-        assert result.is_valid
-        assert result.parsed_value == "上午"
-
-    def test_afternoon(self, validator):
-        """Test afternoon time slot"""
-        result = validator.validate_time_slot("下午")
-        assert result.is_valid
-        assert result.parsed_value == "下午"
-
-    def test_normalize_japanese(self, validator):
-        """Test Japanese time slot normalization"""
-        result = validator.validate_time_slot("午前")
+    @pytest.mark.parametrize("value,expected", [
+        ("上午", "上午"),
+        ("下午", "下午"),
+        ("午前", "上午"),
+        ("午後", "下午"),
+        ("Morning", "上午"),
+        (None, "没有指定"),
+    ])
+    def test_time_slot(self, validator, value, expected):
+        """Test time slot parsing and normalization"""
+        result = validator.validate_time_slot(value)
         assert result.is_valid
-        assert result.parsed_value == "上午"
-
-    def test_none_defaults_to_unspecified(self, validator):
-        """Test None defaults to unspecified"""
-        result = validator.validate_time_slot(None)
-        assert result.is_valid
-        assert result.parsed_value == "没有指定"
+        assert result.parsed_value == expected
 
 
 class TestFieldValidatorFloor:
     """Tests for floor validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_valid_floor(self, validator):
         """Test valid floor number"""
         result = validator.validate_floor(5)
@@ -256,52 +258,48 @@ class TestFieldValidatorFloor:
         result = validator.validate_floor(0)
         assert not result.is_valid
 
+    @pytest.mark.parametrize("value,is_valid,parsed", [
+        ("12 楼", True, 12),
+        ("3", True, 3),
+        ("0F", False, None),
+        ("地下1階", True, "地下1階"),
+    ])
+    def test_floor_string_forms(self, validator, value, is_valid, parsed):
+        """Test suffixed numbers become ints and other text passes through"""
+        result = validator.validate_floor(value)
+        assert result.is_valid is is_valid
+        assert result.parsed_value == parsed
+
 
 class TestFieldValidatorElevator:
     """Tests for elevator validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
-    def test_has_elevator_boolean(self, validator):
-        """Test boolean True"""
-        result = validator.validate_elevator(True)
+    @pytest.mark.parametrize("value,expected", [
+        (True, True),
+        (False, False),
+        ("有电梯", True),
+        ("无电梯", False),
+        ("あり", True),
+        (" Yes ", True),
+        ("なし", False),
+    ])
+    def test_elevator(self, validator, value, expected):
+        """Test elevator values parse to booleans"""
+        result = validator.validate_elevator(value)
         assert result.is_valid
-        assert result.parsed_value is True
+        assert result.parsed_value is expected
 
-    def test_no_elevator_boolean(self, validator):
-        """Test boolean False"""
-        result = validator.validate_elevator(False)
+    def test_unknown_elevator_string(self, validator):
+        """Test '还不清楚' is accepted as pending"""
+        result = validator.validate_elevator(" 还不清楚 ")
         assert result.is_valid
-        assert result.parsed_value is False
-
-    def test_has_elevator_string(self, validator):
-        """Test '有电梯' string"""
-        result = validator.validate_elevator("有电梯")
-        assert result.is_valid
-        assert result.parsed_value is True
-
-    def test_no_elevator_string(self, validator):
-        """Test '无电梯' string"""
-        result = validator.validate_elevator("无电梯")
-        assert result.is_valid
-        assert result.parsed_value is False
-
-    def test_japanese_yes(self, validator):
-        """Test Japanese 'あり'"""
-        result = validator.validate_elevator("あり")
-        assert result.is_valid
-        assert result.parsed_value is True
+        assert result.parsed_value == "还不清楚"
+        assert result.message == "电梯情况待定"
 
 
 class TestFieldValidatorItems:
     """Tests for items validation"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_valid_items_list(self, validator):
         """Test valid items list"""
         items = {
@@ -330,10 +328,6 @@ class TestFieldValidatorItems:
 class TestFieldValidatorRequiresFloorInfo:
     """Tests for requires_floor_info"""
 
-    @pytest.fixture
-    def validator(self):
-        return FieldValidator()
-
     def test_mansion_requires_floor(self, validator):
         """Test マンション requires floor info"""
         assert validator.requires_floor_info("マンション") is True
@@ -350,6 +344,26 @@ class TestFieldValidatorRequiresFloorInfo:
         """Test その他 doesn't require floor info"""
         assert validator.requires_floor_info("その他") is False
 
+    def test_missing_type_no_floor_required(self, validator):
+        """Test an unset building type doesn't require floor info"""
+        assert validator.requires_floor_info(None) is False
+
+
+class TestValidationResult:
+    """Tests for ValidationResult"""
+
+    def test_has_no_instance_dict(self):
+        """Slotted results carry no per-instance __dict__"""
+        result = ValidationResult(is_valid=True, parsed_value=1, status="ideal")
+        assert not hasattr(result, "__dict__")
+        assert result.suggestions == []
+
+    def test_fields_remain_writable(self):
+        """Collector refines results in place, so fields stay assignable"""
+        result = ValidationResult(is_valid=True, parsed_value=None, status="needs_verification")
+        result.status = "baseline"
+        assert result.status == "baseline"
+
 
 class TestGetFieldValidator:
     """Tests for get_field_validator singleton"""
@@ -1,5 +1,7 @@
 """Tests for parser utilities"""
 
+import json
+
 import pytest
 from app.utils.parser import (
     extract_json_from_text,
@@ -9,59 +11,38 @@ from app.utils.parser import (
     parse_extracted_fields,
     parse_next_actions,
     parse_response_strategy,
-    parse_router_output
+    parse_router_output,
+    parse_router_output_stream
 )
 
 
+_KV = '{"key": "value"}'
+
+
 class TestExtractJsonFromText:
     """Tests for extract_json_from_text"""
 
-    def test_pure_json(self):
-        """Test extracting pure JSON"""
-        text = '{"key": "value"}'
-        result = extract_json_from_text(text)
-        assert result == '{"key": "value"}'
-
-    def test_json_in_markdown_block(self):
-        """Test extracting JSON from markdown code block"""
-        text = '''Here is the result:
-```json
-{"key": "value"}
-```
-End of response.'''
-        result = extract_json_from_text(text)
-        assert result == '{"key": "value"}'
-
-    def test_json_in_plain_code_block(self):
-        """Test extracting JSON from plain code block"""
-        text = '''```
-{"key": "value"}
-```'''
-        result = extract_json_from_text(text)
-        assert result == '{"key": "value"}'
-
-    def test_json_with_surrounding_text(self):
-        """Test extracting JSON with surrounding text"""
-        text = 'The answer is {"key": "value"} as shown.'
-        result = extract_json_from_text(text)
-        assert result == '{"key": "value"}'
-
-    def test_nested_json(self):
-        """Test extracting nested JSON"""
-        text = '{"outer": {"inner": "value"}}'
-        result = extract_json_from_text(text)
-        assert result == '{"outer": {"inner": "value"}}'
-
-    def test_empty_text(self):
-        """Test with empty text"""
-        assert extract_json_from_text("") is None
-        assert extract_json_from_text(None) is None
-
-    def test_invalid_json(self):
-        """Test with invalid JSON"""
-        text = 'This is not {json at all'
-        result = extract_json_from_text(text)
-        assert result is None
+    @pytest.mark.parametrize("text,expected", [
+        pytest.param(_KV, _KV, id="pure_json"),
+        pytest.param(f"Here is the result:\n```json\n{_KV}\n```\nEnd of response.", _KV,
+                     id="markdown_block"),
+        pytest.param(f"```\n{_KV}\n```", _KV, id="plain_code_block"),
+        # The fence language tag is matched case-insensitively
+        pytest.param(f"```JSON\n[{_KV}]\n```", f"[{_KV}]", id="uppercase_json_tag"),
+        pytest.param(f"The answer is {_KV} as shown.", _KV, id="surrounding_text"),
+        pytest.param('{"outer": {"inner": "value"}}', '{"outer": {"inner": "value"}}', id="nested"),
+        # Braces inside JSON strings don't end the object
+        pytest.param('Result: {"note": "use } and { freely", "n": 1} done',
+                     '{"note": "use } and { freely", "n": 1}', id="braces_inside_strings"),
+        # A brace group that isn't JSON is skipped
+        pytest.param(f"Template {{name}} filled: {_KV}", _KV, id="skips_non_json_braces"),
+        pytest.param("", None, id="empty"),
+        pytest.param(None, None, id="none"),
+        pytest.param("This is not {json at all", None, id="invalid"),
+    ])
+    def test_extract(self, text, expected):
+        """Test extracting the JSON payload from various wrappings"""
+        assert extract_json_from_text(text) == expected
 
 
 class TestSafeParseJson:
@@ -85,6 +66,23 @@ class TestSafeParseJson:
         result = safe_parse_json(text, {"default": True})
         assert result == {"default": True}
 
+    def test_none_returns_default(self):
+        """Test None input returns default"""
+        assert safe_parse_json(None) == {}
+
+    def test_json_in_code_block(self):
+        """Test parsing JSON wrapped in a code block"""
+        text = '```json\n{"name": "test"}\n```'
+        assert safe_parse_json(text) == {"name": "test"}
+
+    def test_prose_prefix_still_extracts_object(self):
+        """Text that cannot start JSON still falls through to extraction"""
+        assert safe_parse_json('The answer is {"name": "test"}') == {"name": "test"}
+
+    def test_whitespace_only_returns_default(self):
+        """Whitespace-only input returns default"""
+        assert safe_parse_json("   \n") == {}
+
 
 class TestParseIntent:
     """Tests for parse_intent"""
@@ -117,34 +115,36 @@ class TestParseIntent:
         assert result["secondary"] is None
         assert result["confidence"] == 0.8
 
-    def test_confidence_clamping(self):
-        """Test confidence is clamped to [0, 1]"""
-        data = {"intent": {"confidence": 1.5}}
-        result = parse_intent(data)
-        assert result["confidence"] == 1.0
-
-        data = {"intent": {"confidence": -0.5}}
-        result = parse_intent(data)
-        assert result["confidence"] == 0.0
+    @pytest.mark.parametrize("confidence,expected", [
+        (1.5, 1.0),
+        (-0.5, 0.0),
+        (0.9, 0.9),
+        ("high", 0.8),
+    ])
+    def test_confidence_clamping(self, confidence, expected):
+        """Test confidence is clamped to [0, 1]; non-numbers use the default"""
+        result = parse_intent({"intent": {"confidence": confidence}})
+        assert result["confidence"] == expected
 
 
 class TestParseEmotion:
     """Tests for parse_emotion"""
 
-    def test_valid_emotions(self):
-        """Test valid emotion strings"""
-        assert parse_emotion("neutral") == "neutral"
-        assert parse_emotion("positive") == "positive"
-        assert parse_emotion("anxious") == "anxious"
-        assert parse_emotion("confused") == "confused"
-        assert parse_emotion("frustrated") == "frustrated"
-        assert parse_emotion("urgent") == "urgent"
-
-    def test_invalid_emotion(self):
-        """Test invalid emotion falls back to neutral"""
-        assert parse_emotion("happy") == "neutral"
-        assert parse_emotion("sad") == "neutral"
-        assert parse_emotion("") == "neutral"
+    @pytest.mark.parametrize("emotion,expected", [
+        ("neutral", "neutral"),
+        ("positive", "positive"),
+        ("anxious", "anxious"),
+        ("confused", "confused"),
+        ("frustrated", "frustrated"),
+        ("urgent", "urgent"),
+        # Unknown emotions fall back to neutral
+        ("happy", "neutral"),
+        ("sad", "neutral"),
+        ("", "neutral"),
+    ])
+    def test_parse_emotion(self, emotion, expected):
+        """Test valid emotions pass through and invalid ones fall back"""
+        assert parse_emotion(emotion) == expected
 
 
 class TestParseExtractedFields:
@@ -267,6 +267,15 @@ class TestParseRouterOutput:
         assert len(result["next_actions"]) == 2
         assert result["response_strategy"]["agent_type"] == "collector"
 
+    def test_matches_parsed_sample(self, sample_router_output_json, sample_router_output_dict_ro):
+        """Test parsed output keeps the sample's intent and strategy"""
+        result = parse_router_output(sample_router_output_json)
+
+        assert result["intent"] == sample_router_output_dict_ro["intent"]
+        assert result["response_strategy"]["agent_type"] == (
+            sample_router_output_dict_ro["response_strategy"]["agent_type"]
+        )
+
     def test_malformed_json(self):
         """Test handling malformed JSON"""
         text = "not valid json at all"
@@ -284,3 +293,56 @@ class TestParseRouterOutput:
 
         assert result["intent"]["primary"] == "ask_price"
         assert result["user_emotion"] == "neutral"  # default
+
+
+class TestParseRouterOutputStream:
+    """Tests for parse_router_output_stream"""
+
+    def test_chunks_match_single_text(self, sample_router_output_json):
+        """Test chunked input parses the same as the whole text"""
+        chunks = [sample_router_output_json[i:i + 7]
+                  for i in range(0, len(sample_router_output_json), 7)]
+        assert parse_router_output_stream(chunks) == parse_router_output(sample_router_output_json)
+
+    def test_nested_close_does_not_stop_early(self):
+        """Test a chunk closing a nested object doesn't end the stream"""
+        chunks = ['{"intent": {"primary": "ask_price"}', ', "current_phase": 2}']
+        result = parse_router_output_stream(chunks)
+        assert result["intent"]["primary"] == "ask_price"
+        assert result["current_phase"] == 2
+
+    def test_stops_after_complete_object(self):
+        """Test chunks after the complete object are not consumed"""
+        chunks = iter(['{"current_phase": 3}', "trailing"])
+        result = parse_router_output_stream(chunks)
+        assert result["current_phase"] == 3
+        assert next(chunks) == "trailing"
+
+    def test_fenced_stream_falls_back(self):
+        """Test a fenced payload is parsed once the stream ends"""
+        chunks = ["```json\n", '{"user_emotion": "anxious"}', "\n```"]
+        result = parse_router_output_stream(chunks)
+        assert result["user_emotion"] == "anxious"
+
+    def test_empty_stream(self):
+        """Test an empty stream returns defaults"""
+        result = parse_router_output_stream([])
+        assert result["intent"]["primary"] == "provide_info"
+
+    def test_prose_prefix_decoded_once(self, sample_router_output_json, monkeypatch):
+        """Test a prose-prefixed payload streamed in small chunks is decoded once"""
+        text = "Sure, here is the analysis {as requested}:\n" + sample_router_output_json
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        decoded = []
+        loads = json.loads
+
+        def counting_loads(value, *args, **kwargs):
+            decoded.append(value)
+            return loads(value, *args, **kwargs)
+
+        monkeypatch.setattr(json, "loads", counting_loads)
+        result = parse_router_output_stream(chunks)
+
+        # One failed attempt on the "{as requested}" prose, then the payload itself
+        assert decoded == ["{as requested}", sample_router_output_json]
+        assert result == parse_router_output(sample_router_output_json)
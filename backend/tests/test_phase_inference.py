@@ -6,8 +6,13 @@ from app.core.phase_inference import (
     infer_phase,
     get_next_priority_field,
     get_completion_info,
-    get_quick_options_for_phase
+    get_quick_options_for_phase,
+    completion_bits,
+    APARTMENT_TYPES,
+    COMPLETION_CHECKS,
+    PRIORITY_ORDER
 )
+from app.services.field_validator import FieldValidator
 
 
 class TestInferPhase:
@@ -92,9 +97,9 @@ class TestInferPhase:
         result = infer_phase(fields)
         assert result == Phase.OTHER_INFO
 
-    def test_complete_returns_confirmation_phase(self, complete_fields_status):
+    def test_complete_returns_confirmation_phase(self, complete_fields_status_ro):
         """Complete fields should return confirmation phase"""
-        result = infer_phase(complete_fields_status)
+        result = infer_phase(complete_fields_status_ro)
         assert result == Phase.CONFIRMATION
 
 
@@ -114,9 +119,9 @@ class TestGetNextPriorityField:
         result = get_next_priority_field(fields)
         assert result == "from_address"
 
-    def test_complete_returns_none(self, complete_fields_status):
+    def test_complete_returns_none(self, complete_fields_status_ro):
         """Complete fields should return None"""
-        result = get_next_priority_field(complete_fields_status)
+        result = get_next_priority_field(complete_fields_status_ro)
         assert result is None
 
 
@@ -141,14 +146,32 @@ class TestGetCompletionInfo:
         assert result["completed"] > 0
         assert result["completed"] < result["total_required"]
 
-    def test_complete_fields(self, complete_fields_status):
+    def test_complete_fields(self, complete_fields_status_ro):
         """Complete fields should be submittable"""
-        result = get_completion_info(complete_fields_status)
+        result = get_completion_info(complete_fields_status_ro)
 
         assert result["can_submit"] is True
         assert result["completion_rate"] == 1.0
         assert result["missing_fields"] == []
 
+    def test_bits_match_missing_fields(self, partial_fields_status):
+        """Each unset bit corresponds to a missing field, in table order"""
+        bits = completion_bits(partial_fields_status)
+        result = get_completion_info(partial_fields_status)
+
+        unset = [name for i, (name, _) in enumerate(COMPLETION_CHECKS) if not bits & (1 << i)]
+        assert unset == result["missing_fields"]
+        assert bits.bit_count() == result["completed"]
+
+    def test_house_sets_apartment_only_bits(self, partial_fields_status):
+        """A detached house completes room type and from-floor checks automatically"""
+        partial_fields_status["from_address"]["building_type"] = "戸建て"
+        names = [name for name, _ in COMPLETION_CHECKS]
+        bits = completion_bits(partial_fields_status)
+
+        assert bits & (1 << names.index("from_room_type"))
+        assert bits & (1 << names.index("from_floor_elevator"))
+
 
 class TestGetQuickOptionsForPhase:
     """Tests for get_quick_options_for_phase function"""
@@ -167,9 +190,9 @@ class TestGetQuickOptionsForPhase:
         assert "单身" in options or "單身" in options
         assert any("人" in opt for opt in options)
 
-    def test_confirmation_phase_options(self, complete_fields_status):
+    def test_confirmation_phase_options(self, complete_fields_status_ro):
         """Confirmation phase should have confirm/modify options"""
-        options = get_quick_options_for_phase(Phase.CONFIRMATION, complete_fields_status)
+        options = get_quick_options_for_phase(Phase.CONFIRMATION, complete_fields_status_ro)
 
         assert len(options) >= 2
 
@@ -181,3 +204,34 @@ class TestGetQuickOptionsForPhase:
 
         if options:  # Only if items phase returns options
             assert any("继续" in opt or "没有" in opt for opt in options)
+
+    def test_special_notes_options_exclude_selected(self):
+        """Already selected special notes are not offered again"""
+        fields = {"special_notes": ["空调安装"]}
+        options = get_quick_options_for_phase(Phase.OTHER_INFO, fields, {"asking_special_notes": True})
+
+        assert "空调安装" not in options
+        assert options[-1] == "没有了"
+
+    def test_returned_options_are_fresh_lists(self, empty_fields_status):
+        """Mutating returned options doesn't affect later calls"""
+        options = get_quick_options_for_phase(Phase.OPENING, empty_fields_status)
+        options.clear()
+
+        assert get_quick_options_for_phase(Phase.OPENING, empty_fields_status)
+
+
+class TestPriorityOrderTable:
+    """Tests for the PRIORITY_ORDER table"""
+
+    def test_field_order(self):
+        """Fields are checked in collection order"""
+        assert [name for name, _ in PRIORITY_ORDER] == [
+            "people_count", "from_address", "from_building_type", "from_room_type",
+            "to_address", "move_date", "items", "from_floor_elevator",
+            "to_floor_elevator", "packing_service", "special_notes"
+        ]
+
+    def test_apartment_types_match_validator(self):
+        """Phase inference and the validator agree on apartment types"""
+        assert APARTMENT_TYPES == FieldValidator.APARTMENT_TYPES
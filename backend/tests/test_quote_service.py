@@ -1,7 +1,7 @@
 """Tests for Quote Service"""
 
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch
 from datetime import datetime
 import uuid
 
@@ -62,6 +62,13 @@ class TestQuoteServicePrepareData:
         assert "_meta" in result
         assert "submitted_at" in result["_meta"]
 
+    def test_prepare_uses_given_timestamp(self):
+        """Test submitted_at reuses the caller's timestamp"""
+        submitted_at = datetime(2024, 4, 1, 9, 30)
+        result = QuoteService._prepare_quote_data({}, submitted_at)
+
+        assert result["_meta"]["submitted_at"] == "2024-04-01T09:30:00"
+
     def test_prepare_excludes_empty_values(self):
         """Test that empty values are excluded"""
         fields_status = {
@@ -76,7 +83,17 @@ class TestQuoteServicePrepareData:
         assert "people_count" in result
         assert "empty_field" not in result
         assert "none_field" not in result
-        # Note: 0 is falsy in Python, so it might be excluded
+        assert result["zero_field"]["value"] == 0
+
+    def test_prepare_plain_values(self):
+        """Test non-dict values are stored as confirmed"""
+        fields_status = {"people_count": 2, "special_notes_done": False, "packing_service": ""}
+
+        result = QuoteService._prepare_quote_data(fields_status)
+
+        assert result["people_count"] == {"value": 2, "confirmed": True}
+        assert result["special_notes_done"] == {"value": False, "confirmed": True}
+        assert "packing_service" not in result
 
 
 class TestQuoteServiceCreate:
@@ -93,54 +110,41 @@ class TestQuoteServiceCreate:
         }
 
     @pytest.mark.asyncio
-    async def test_create_quote_structure(self, sample_fields):
+    async def test_create_quote_structure(self, sample_fields, mock_db_session):
         """Test that create_quote returns expected structure"""
-        # This test requires database mocking
-        with patch('app.services.quote_service.get_db_context') as mock_db:
-            mock_session = AsyncMock()
-            mock_session.execute = AsyncMock(return_value=MagicMock(
-                scalar_one_or_none=MagicMock(return_value=None)
-            ))
-            mock_session.add = MagicMock()
-            mock_session.flush = AsyncMock()
+        session = mock_db_session(scalar_result=None)
 
-            mock_db.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_db.return_value.__aexit__ = AsyncMock()
+        result = await QuoteService.create_quote(
+            session_token="test-token",
+            fields_status=sample_fields
+        )
 
-            # The test would need proper database setup to fully run
-            # For now, we test the data preparation logic
-            prepared = QuoteService._prepare_quote_data(sample_fields)
-
-            assert "people_count" in prepared
-            assert "from_address" in prepared
-            assert "_meta" in prepared
+        assert result["status"] == "submitted"
+        assert result["collected_data"]["_meta"]["submitted_at"] == result["created_at"]
+        assert "people_count" in result["collected_data"]
+        assert "from_address" in result["collected_data"]
+        assert "_meta" in result["collected_data"]
+        assert len(session.added) == 1
+        assert session.flush_count == 1
 
 
 class TestSessionPersistenceService:
     """Tests for SessionPersistenceService"""
 
     @pytest.mark.asyncio
-    async def test_persist_session_creates_new(self):
+    async def test_persist_session_creates_new(self, mock_db_session):
         """Test persisting a new session"""
-        with patch('app.services.quote_service.get_db_context') as mock_db:
-            mock_session = AsyncMock()
-            mock_session.execute = AsyncMock(return_value=MagicMock(
-                scalar_one_or_none=MagicMock(return_value=None)  # No existing session
-            ))
-            mock_session.add = MagicMock()
+        session = mock_db_session(scalar_result=None)  # No existing session
 
-            mock_db.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_db.return_value.__aexit__ = AsyncMock()
+        result = await SessionPersistenceService.persist_session(
+            session_token="test-token",
+            session_id=str(uuid.uuid4()),
+            current_phase=2,
+            fields_status={"people_count": 3}
+        )
 
-            result = await SessionPersistenceService.persist_session(
-                session_token="test-token",
-                session_id=str(uuid.uuid4()),
-                current_phase=2,
-                fields_status={"people_count": 3}
-            )
-
-            assert result is True
-            mock_session.add.assert_called_once()
+        assert result is True
+        assert len(session.added) == 1
 
 
 class TestSubmitQuoteFunction:
@@ -177,60 +181,39 @@ class TestQuoteServiceGetQuote:
     """Tests for QuoteService.get_quote"""
 
     @pytest.mark.asyncio
-    async def test_get_nonexistent_quote(self):
+    async def test_get_nonexistent_quote(self, mock_db_session):
         """Test getting a quote that doesn't exist"""
-        with patch('app.services.quote_service.get_db_context') as mock_db:
-            mock_session = AsyncMock()
-            mock_session.execute = AsyncMock(return_value=MagicMock(
-                scalar_one_or_none=MagicMock(return_value=None)
-            ))
+        mock_db_session(scalar_result=None)
 
-            mock_db.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_db.return_value.__aexit__ = AsyncMock()
+        result = await QuoteService.get_quote(str(uuid.uuid4()))
 
-            result = await QuoteService.get_quote(str(uuid.uuid4()))
-
-            assert result is None
+        assert result is None
 
 
 class TestQuoteServiceUpdateStatus:
     """Tests for QuoteService.update_quote_status"""
 
     @pytest.mark.asyncio
-    async def test_update_to_completed(self):
+    async def test_update_to_completed(self, mock_db_session):
         """Test updating quote status to completed"""
-        with patch('app.services.quote_service.get_db_context') as mock_db:
-            mock_session = AsyncMock()
-            mock_result = MagicMock()
-            mock_result.rowcount = 1
-            mock_session.execute = AsyncMock(return_value=mock_result)
-
-            mock_db.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_db.return_value.__aexit__ = AsyncMock()
-
-            result = await QuoteService.update_quote_status(
-                quote_id=str(uuid.uuid4()),
-                status="completed",
-                completed=True
-            )
+        mock_db_session(rowcount=1)
 
-            assert result is True
+        result = await QuoteService.update_quote_status(
+            quote_id=str(uuid.uuid4()),
+            status="completed",
+            completed=True
+        )
+
+        assert result is True
 
     @pytest.mark.asyncio
-    async def test_update_nonexistent_quote(self):
+    async def test_update_nonexistent_quote(self, mock_db_session):
         """Test updating a quote that doesn't exist"""
-        with patch('app.services.quote_service.get_db_context') as mock_db:
-            mock_session = AsyncMock()
-            mock_result = MagicMock()
-            mock_result.rowcount = 0
-            mock_session.execute = AsyncMock(return_value=mock_result)
-
-            mock_db.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_db.return_value.__aexit__ = AsyncMock()
-
-            result = await QuoteService.update_quote_status(
-                quote_id=str(uuid.uuid4()),
-                status="processing"
-            )
+        mock_db_session(rowcount=0)
+
+        result = await QuoteService.update_quote_status(
+            quote_id=str(uuid.uuid4()),
+            status="processing"
+        )
 
-            assert result is False
+        assert result is False
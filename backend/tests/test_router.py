@@ -1,117 +1,179 @@
 """Tests for Router Agent"""
 
+import operator
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.config import settings
 from app.agents.router import RouterAgent, get_router_agent
 from app.models.schemas import IntentType, Emotion, AgentType
 from app.models.fields import FieldStatus, Phase
 
 
+pytestmark = pytest.mark.unit
+
+
+# Canned chat_complete results, built once; tests hand them to the fake LLM as-is (read-only)
+_RESPONSES = {
+    name: {"content": content, "error": None}
+    for name, content in {
+        "provide_info": '{"intent": {"primary": "provide_info", "confidence": 0.9}}',
+        "ask_price": '{"intent": {"primary": "ask_price", "confidence": 0.85}}',
+        "anxious": '{"intent": {"primary": "express_anxiety"}, "user_emotion": "anxious"}',
+    }.items()
+}
+
+
+@pytest.fixture
+def fake_llm(router_agent, fake_llm_client):
+    """Point the shared router at a fresh fake LLM client for one test"""
+    router_agent.clear_cache()
+    original = router_agent.llm_client
+    router_agent.llm_client = fake_llm_client
+    yield fake_llm_client
+    router_agent.llm_client = original
+
+
+def _check_sample_output(result):
+    assert result.intent.primary is IntentType.PROVIDE_INFO
+    assert result.intent.confidence == 0.95
+    assert result.user_emotion is Emotion.NEUTRAL
+    assert "people_count" in result.extracted_fields
+
+
+def _check_error_fallback(result):
+    assert result.intent.primary is IntentType.PROVIDE_INFO
+    assert result.intent.confidence == 0.5  # Lower confidence for fallback
+
+
+def _check_malformed_fallback(result):
+    assert result.intent is not None
+    assert result.response_strategy is not None
+
+
+# (LLM content, LLM error, check); content None means the conftest sample output
+ANALYZE_CASES = [
+    pytest.param(None, None, _check_sample_output, id="returns_router_output"),
+    pytest.param("", "API timeout", _check_error_fallback, id="handles_llm_error"),
+    pytest.param("This is not valid JSON", None, _check_malformed_fallback, id="handles_malformed_json"),
+]
+
+
 class TestRouterAgent:
     """Tests for RouterAgent class"""
 
-    @pytest.fixture
-    def router_agent(self):
-        """Create router agent fixture"""
-        return RouterAgent()
-
+    @pytest.mark.parametrize("content,error,check", ANALYZE_CASES)
     @pytest.mark.asyncio
-    async def test_analyze_returns_router_output(
+    async def test_analyze(
         self,
         router_agent,
+        fake_llm,
         empty_fields_status,
-        sample_router_output_json
+        sample_router_output_json,
+        content,
+        error,
+        check
     ):
-        """Test analyze returns valid RouterOutput"""
-        # Mock LLM client
-        mock_response = {
-            "content": sample_router_output_json,
-            "error": None
+        """Test analyze returns a RouterOutput, falling back on LLM errors and bad JSON"""
+        fake_llm.next_response = {
+            "content": sample_router_output_json if content is None else content,
+            "error": error
         }
 
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="2个人搬家",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
-
-            assert result.intent.primary == IntentType.PROVIDE_INFO
-            assert result.intent.confidence == 0.95
-            assert result.user_emotion == Emotion.NEUTRAL
-            assert "people_count" in result.extracted_fields
+        result = await router_agent.analyze(
+            user_message="2个人搬家",
+            fields_status=empty_fields_status,
+            recent_messages=[]
+        )
+
+        check(result)
+
+
+@pytest.fixture(scope="module")
+def parsed_sample(bare_router, sample_router_output_json):
+    """Sample router output parsed once per module; treat as read-only"""
+    return bare_router._parse_response(sample_router_output_json, {})
+
+
+class TestRouterAgentParseResponse:
+    """Tests for RouterAgent._parse_response on the shared sample output"""
+
+    @pytest.mark.parametrize("attr,expected", [
+        ("intent.primary", IntentType.PROVIDE_INFO),
+        ("intent.confidence", 0.95),
+        ("user_emotion", Emotion.NEUTRAL),
+        ("current_phase", 1),
+        ("phase_after_update", 1),
+        ("response_strategy.agent_type", AgentType.COLLECTOR),
+        ("response_strategy.guide_to_field", "from_address"),
+        ("response_strategy.include_options", False),
+    ])
+    def test_sample_fields(self, parsed_sample, attr, expected):
+        """Each section of the sample output is parsed into the model"""
+        assert operator.attrgetter(attr)(parsed_sample) == expected
+
+    def test_sample_extraction_applied(self, parsed_sample):
+        """Extracted fields are parsed and merged into updated_fields_status"""
+        assert parsed_sample.extracted_fields["people_count"].parsed_value == 2
+        assert parsed_sample.updated_fields_status["people_count"] == 2
+        assert [action.target for action in parsed_sample.next_actions] == [
+            "people_count", "from_address"
+        ]
+
+
+class TestRouterAgentResponseCache:
+    """Tests for the analyze() output cache"""
+
+    async def _analyze(self, router_agent, message, fields_status):
+        return await router_agent.analyze(
+            user_message=message,
+            fields_status=fields_status,
+            recent_messages=[]
+        )
 
     @pytest.mark.asyncio
-    async def test_analyze_handles_llm_error(
-        self,
-        router_agent,
-        empty_fields_status
+    async def test_identical_input_skips_llm(
+        self, router_agent, fake_llm, empty_fields_status, sample_router_output_json
     ):
-        """Test analyze handles LLM errors gracefully"""
-        mock_response = {
-            "content": "",
-            "error": "API timeout"
-        }
+        """A repeated message with the same fields reuses the parsed output"""
+        fake_llm.next_response = {"content": sample_router_output_json, "error": None}
 
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="test message",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
+        first = await self._analyze(router_agent, "2个人搬家", empty_fields_status)
+        first.updated_fields_status["people_count"] = 99
+        second = await self._analyze(router_agent, "2个人搬家", empty_fields_status)
 
-            # Should return fallback output
-            assert result.intent.primary == IntentType.PROVIDE_INFO
-            assert result.intent.confidence == 0.5  # Lower confidence for fallback
+        assert len(fake_llm.calls) == 1
+        assert second is not first
+        assert second.updated_fields_status["people_count"] == 2
 
     @pytest.mark.asyncio
-    async def test_analyze_handles_malformed_json(
-        self,
-        router_agent,
-        empty_fields_status
+    async def test_fallback_not_cached(self, router_agent, fake_llm, empty_fields_status):
+        """LLM errors are retried rather than served from the cache"""
+        fake_llm.next_response = {"content": "", "error": "API timeout"}
+
+        await self._analyze(router_agent, "test message", empty_fields_status)
+        await self._analyze(router_agent, "test message", empty_fields_status)
+
+        assert len(fake_llm.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(
+        self, router_agent, fake_llm, empty_fields_status, sample_router_output_json, monkeypatch
     ):
-        """Test analyze handles malformed JSON from LLM"""
-        mock_response = {
-            "content": "This is not valid JSON",
-            "error": None
-        }
+        """Entries beyond router_cache_size are evicted oldest first"""
+        monkeypatch.setattr(settings, "router_cache_size", 1)
+        fake_llm.next_response = {"content": sample_router_output_json, "error": None}
 
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="test message",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
+        for message in ("2个人搬家", "3个人搬家", "2个人搬家"):
+            await self._analyze(router_agent, message, empty_fields_status)
 
-            # Should return fallback output
-            assert result.intent is not None
-            assert result.response_strategy is not None
+        assert len(fake_llm.calls) == 3
 
 
 class TestRouterAgentUpdateFields:
     """Tests for RouterAgent._update_fields_status"""
 
-    @pytest.fixture
-    def router_agent(self):
-        return RouterAgent()
-
-    def test_update_people_count(self, router_agent, empty_fields_status):
+    def test_update_people_count(self, bare_router, empty_fields_status):
         """Test updating people_count field"""
         from app.models.schemas import ExtractedField
 
@@ -125,12 +187,12 @@ class TestRouterAgentUpdateFields:
             )
         }
 
-        result = router_agent._update_fields_status(empty_fields_status, extracted)
+        result = bare_router._update_fields_status(empty_fields_status, extracted)
 
         assert result["people_count"] == 3
         assert result["people_count_status"] == FieldStatus.IDEAL.value
 
-    def test_update_from_address(self, router_agent, empty_fields_status):
+    def test_update_from_address(self, bare_router, empty_fields_status):
         """Test updating from_address field"""
         from app.models.schemas import ExtractedField
 
@@ -144,13 +206,13 @@ class TestRouterAgentUpdateFields:
             )
         }
 
-        result = router_agent._update_fields_status(empty_fields_status, extracted)
+        result = bare_router._update_fields_status(empty_fields_status, extracted)
 
         assert result["from_address"]["value"] == "東京都渋谷区神宮前"
         # With needs_verification=True, should be IN_PROGRESS
         assert result["from_address"]["status"] == FieldStatus.IN_PROGRESS.value
 
-    def test_update_special_notes_appends(self, router_agent):
+    def test_update_special_notes_appends(self, bare_router):
         """Test special_notes appends to list"""
         from app.models.schemas import ExtractedField
 
@@ -165,7 +227,7 @@ class TestRouterAgentUpdateFields:
             )
         }
 
-        result = router_agent._update_fields_status(fields, extracted)
+        result = bare_router._update_fields_status(fields, extracted)
 
         assert "有钢琴" in result["special_notes"]
         assert "有宜家家具" in result["special_notes"]
@@ -174,24 +236,20 @@ class TestRouterAgentUpdateFields:
 class TestRouterAgentInferPhase:
     """Tests for RouterAgent._infer_phase"""
 
-    @pytest.fixture
-    def router_agent(self):
-        return RouterAgent()
-
-    def test_infer_phase_empty(self, router_agent, empty_fields_status):
+    def test_infer_phase_empty(self, bare_router, empty_fields_status_ro):
         """Empty fields should infer people count phase"""
-        result = router_agent._infer_phase(empty_fields_status)
+        result = bare_router._infer_phase(empty_fields_status_ro)
         assert result == Phase.PEOPLE_COUNT.value
 
-    def test_infer_phase_with_people(self, router_agent):
+    def test_infer_phase_with_people(self, bare_router):
         """With people count, should infer address phase"""
         fields = {"people_count_status": "ideal"}
-        result = router_agent._infer_phase(fields)
+        result = bare_router._infer_phase(fields)
         assert result == Phase.ADDRESS.value
 
-    def test_infer_phase_confirmation(self, router_agent, complete_fields_status):
+    def test_infer_phase_confirmation(self, bare_router, complete_fields_status_ro):
         """Complete fields should infer confirmation phase"""
-        result = router_agent._infer_phase(complete_fields_status)
+        result = bare_router._infer_phase(complete_fields_status_ro)
         assert result == Phase.CONFIRMATION.value
 
 
@@ -210,76 +268,39 @@ class TestGetRouterAgent:
         assert isinstance(agent, RouterAgent)
 
 
-class TestRouterAgentIntentRecognition:
-    """Integration tests for intent recognition scenarios"""
-
-    @pytest.fixture
-    def router_agent(self):
-        return RouterAgent()
-
-    @pytest.mark.asyncio
-    async def test_provide_info_intent(self, router_agent, empty_fields_status):
-        """Test recognition of provide_info intent"""
-        # This would require actual LLM call, so we mock it
-        mock_response = {
-            "content": '{"intent": {"primary": "provide_info", "confidence": 0.9}}',
-            "error": None
-        }
-
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="3个人搬家",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
-
-            assert result.intent.primary == IntentType.PROVIDE_INFO
+# (user message, chat_complete result, RouterOutput attribute, expected value)
+RECOGNITION_CASES = [
+    pytest.param("3个人搬家", _RESPONSES["provide_info"], "intent.primary", IntentType.PROVIDE_INFO,
+                 id="provide_info_intent"),
+    pytest.param("大概要多少钱？", _RESPONSES["ask_price"], "intent.primary", IntentType.ASK_PRICE,
+                 id="ask_price_intent"),
+    pytest.param("搬家好烦啊，不知道怎么弄", _RESPONSES["anxious"], "user_emotion", Emotion.ANXIOUS,
+                 id="emotion_detection"),
+]
 
-    @pytest.mark.asyncio
-    async def test_ask_price_intent(self, router_agent, empty_fields_status):
-        """Test recognition of ask_price intent"""
-        mock_response = {
-            "content": '{"intent": {"primary": "ask_price", "confidence": 0.85}}',
-            "error": None
-        }
 
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="大概要多少钱？",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
-
-            assert result.intent.primary == IntentType.ASK_PRICE
+class TestRouterAgentIntentRecognition:
+    """Integration tests for intent recognition scenarios"""
 
+    @pytest.mark.parametrize("message,reply,attr,expected", RECOGNITION_CASES)
     @pytest.mark.asyncio
-    async def test_emotion_detection(self, router_agent, empty_fields_status):
-        """Test emotion detection in messages"""
-        mock_response = {
-            "content": '{"intent": {"primary": "express_anxiety"}, "user_emotion": "anxious"}',
-            "error": None
-        }
+    async def test_recognition(
+        self,
+        router_agent,
+        fake_llm,
+        empty_fields_status,
+        message,
+        reply,
+        attr,
+        expected
+    ):
+        """Test the analyzed output carries the intent/emotion from the LLM reply"""
+        fake_llm.next_response = reply
 
-        with patch.object(
-            router_agent.llm_client,
-            'chat_complete',
-            new_callable=AsyncMock,
-            return_value=mock_response
-        ):
-            result = await router_agent.analyze(
-                user_message="搬家好烦啊，不知道怎么弄",
-                fields_status=empty_fields_status,
-                recent_messages=[]
-            )
+        result = await router_agent.analyze(
+            user_message=message,
+            fields_status=empty_fields_status,
+            recent_messages=[]
+        )
 
-            assert result.user_emotion == Emotion.ANXIOUS
+        assert operator.attrgetter(attr)(result) is expected
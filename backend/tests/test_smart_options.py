@@ -0,0 +1,71 @@
+"""Tests for smart quick options service"""
+
+import pytest
+from app.models.fields import Phase
+from app.services.smart_options import (
+    get_smart_quick_options,
+    match_field_options
+)
+
+
+class TestGetSmartQuickOptions:
+    """Tests for get_smart_quick_options"""
+
+    @pytest.mark.asyncio
+    async def test_opening_phase_options(self, empty_fields_status):
+        """Untouched session gets opening options"""
+        options = await get_smart_quick_options(empty_fields_status)
+        assert options == ["获取搬家报价", "咨询搬家问题", "了解服务内容"]
+
+    @pytest.mark.asyncio
+    async def test_uses_precomputed_phase(self, empty_fields_status):
+        """Caller-provided phase skips inference"""
+        options = await get_smart_quick_options(
+            empty_fields_status,
+            next_field="people_count",
+            phase=Phase.PEOPLE_COUNT
+        )
+        assert options == ["单身", "2~3人", "4人以上"]
+
+    @pytest.mark.asyncio
+    async def test_uses_precomputed_completion_info(self, partial_fields_status):
+        """Caller-provided completion info drives the confirmation options"""
+        options = await get_smart_quick_options(
+            partial_fields_status,
+            phase=Phase.CONFIRMATION,
+            completion_info={"can_submit": True}
+        )
+        assert options == ["确认无误，发送报价", "需要修改"]
+
+
+class TestMatchFieldOptions:
+    """Tests for the next_field option rule table"""
+
+    @pytest.mark.parametrize("next_field,expected", [
+        ("people_count", ["单身", "2~3人", "4人以上"]),
+        ("from_floor_elevator", ["有电梯", "无电梯"]),
+        ("to_floor_elevator", ["有电梯", "无电梯", "还不清楚"]),
+        ("from_address", []),
+        ("move_date", ["这个月", "下个月", "再下个月"]),
+        ("items", []),
+    ])
+    def test_rules(self, empty_fields_status, next_field, expected):
+        """Each rule yields its options for an empty session"""
+        assert match_field_options(next_field, empty_fields_status) == expected
+
+    def test_unknown_field_returns_none(self, empty_fields_status):
+        """Fields without a rule fall through"""
+        assert match_field_options(None, empty_fields_status) is None
+        assert match_field_options("unknown", empty_fields_status) is None
+
+    def test_special_notes_filters_selected(self, empty_fields_status):
+        """Already selected special notes are not offered again"""
+        empty_fields_status["special_notes"] = ["空调安装"]
+        options = match_field_options("special_notes", empty_fields_status)
+        assert "空调安装" not in options
+        assert "没有了" in options
+
+    def test_move_date_with_month_asks_period(self, empty_fields_status):
+        """A month without day or period asks for the period"""
+        empty_fields_status["move_date"] = {"month": 3}
+        assert match_field_options("move_date", empty_fields_status) == ["上旬", "中旬", "下旬"]